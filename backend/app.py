@@ -25,6 +25,13 @@ if str(BASE_DIR) not in sys.path:
 if load_dotenv is not None:
     load_dotenv(dotenv_path=BASE_DIR / ".env", override=False)
 
+# Cap BLAS/OpenMP threads before anything imports torch (the NLP, NER, CLIP and
+# embedding models all run in this process), so concurrent encodes don't each
+# spawn a full-width pool and oversubscribe the CPU; an explicit env value wins
+_MODEL_THREADS = str((os.cpu_count() or 2) // 2 or 1)
+os.environ.setdefault("OMP_NUM_THREADS", _MODEL_THREADS)
+os.environ.setdefault("MKL_NUM_THREADS", _MODEL_THREADS)
+
 from db.postgresql_connector import PostgreSQLConnector
 from db.neo4j_connector import Neo4jConnector
 from models.nlp_processor import NLPProcessor
@@ -37,6 +44,8 @@ from routes.memory_routes import memory_router
 from routes.graph_routes import graph_router
 from routes.image_serve_routes import image_router
 from routes.summarization_routes import summarization_router
+from utils.gemini_summarizer import batch_summary_worker, summary_queue_worker
+from utils.http import close_http_client
 from auth.auth_routes import auth_router, initialize_auth
 
 # Initialize FastAPI app
@@ -141,6 +150,10 @@ async def startup_event():
         await user_manager.create_users_table()
         print("✅ Authentication system initialized")
         
+        # Start background summary consumers (the app owns their lifecycle)
+        batch_summary_worker.start(postgres_db.update_memory_summary)
+        summary_queue_worker.start(postgres_db.update_memory_summary)
+        
         print("🎉 Backend services initialized successfully!")
         print(f"📊 Model Stack Summary:")
         print(f"   • Sentiment: DistilBERT → VADER fallback")
@@ -155,8 +168,11 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up connections on shutdown"""
+    summary_queue_worker.stop()
+    batch_summary_worker.stop()
     await postgres_db.disconnect()
     await neo4j_db.disconnect()
+    await close_http_client()
     print("🔌 Database connections closed")
 
 @app.get("/")
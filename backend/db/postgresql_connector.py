@@ -170,6 +170,8 @@ class PostgreSQLConnector:
             await conn.execute("ALTER TABLE memories ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP;")
             # Store-only ciphertext column (plain text is still stored in raw_text)
             await conn.execute("ALTER TABLE memories ADD COLUMN IF NOT EXISTS cipher_text TEXT;")
+            # AI-generated summary, filled in asynchronously after ingest
+            await conn.execute("ALTER TABLE memories ADD COLUMN IF NOT EXISTS summary TEXT;")
             # Ensure supporting tables exist even if create_tables_sql was previously trimmed
             await conn.execute("""
             CREATE TABLE IF NOT EXISTS activity_logs (
@@ -228,6 +230,12 @@ class PostgreSQLConnector:
             )
         return memory_id
 
+    async def update_memory_summary(self, memory_id: int, summary: str):
+        """Store the generated summary for a memory"""
+        query = "UPDATE memories SET summary = $1 WHERE id = $2"
+        async with self.connection_pool.acquire() as conn:
+            await conn.execute(query, summary, memory_id)
+
     async def insert_entities(self, memory_id: int, entities: List[Dict]):
         """Insert extracted entities for a memory"""
         if not entities:
@@ -578,7 +586,7 @@ class PostgreSQLConnector:
         
         # Build the base query
         search_query = f"""
-        SELECT m.id, m.raw_text, m.processed_text, m.type, m.timestamp, m.metadata, m.embedding_id, m.created_at, m.updated_at, m.user_id,
+        SELECT m.id, m.raw_text, m.processed_text, m.type, m.timestamp, m.metadata, m.embedding_id, m.created_at, m.updated_at, m.user_id, m.summary,
                COALESCE(
                    (SELECT json_agg(jsonb_build_object(
                        'entity', e2.entity, 
@@ -601,7 +609,7 @@ class PostgreSQLConnector:
         LEFT JOIN entities e ON m.id = e.memory_id
         LEFT JOIN sentiments s ON m.id = s.memory_id
         {where_clause}
-        GROUP BY m.id, m.raw_text, m.processed_text, m.type, m.timestamp, m.metadata, m.embedding_id, m.created_at, m.updated_at, m.user_id
+        GROUP BY m.id, m.raw_text, m.processed_text, m.type, m.timestamp, m.metadata, m.embedding_id, m.created_at, m.updated_at, m.user_id, m.summary
         ORDER BY m.timestamp DESC
         LIMIT {limit_param}
         """
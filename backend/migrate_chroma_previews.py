@@ -0,0 +1,29 @@
+"""
+One-time migration - stores a document preview in ChromaDB metadata
+so semantic search no longer has to fetch document bodies
+"""
+import asyncio
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.embeddings import EmbeddingProcessor
+
+async def run_migration():
+    """Backfill the preview metadata field for existing text embeddings"""
+    print("\n" + "="*70)
+    print("CHROMADB MIGRATION - Adding preview to text embedding metadata")
+    print("="*70)
+
+    embedding_processor = EmbeddingProcessor()
+    try:
+        await embedding_processor.initialize()
+        updated = await embedding_processor.migrate_previews()
+        print(f"\n✅ {updated} embeddings migrated")
+    finally:
+        embedding_processor.cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
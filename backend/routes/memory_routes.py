@@ -19,6 +19,7 @@ from utils.embeddings import EmbeddingProcessor
 from utils.audio_processor import AudioProcessor
 from utils.clip_processor import CLIPImageProcessor
 from utils.groq_client import groq_client
+from utils.gemini_summarizer import batch_summary_worker, summary_queue_worker
 import traceback
 
 # Router instance
@@ -234,6 +235,21 @@ async def add_text_memory(
                 return [convert_numpy_types(v) for v in obj]
             return obj
         
+        # Hand off summarization so the response doesn't wait on Gemini:
+        # offline batch job when GEMINI_BATCH_MODE=1, otherwise the live summary queue
+        summary_memory = {
+            "id": memory_id,
+            "type": "text",
+            "raw_text": request.text,
+            "timestamp": datetime.now().isoformat(),
+            "entities": [{"entity": e.get("text", ""), "type": e.get("label", "")} for e in nlp_result["entities"]],
+            "sentiments": [nlp_result["sentiment"]] if nlp_result["sentiment"] else []
+        }
+        if batch_summary_worker.enabled:
+            batch_summary_worker.enqueue(summary_memory)
+        else:
+            summary_queue_worker.enqueue(summary_memory)
+        
         # Return response
         print(f"✅ Memory stored successfully with ID: {memory_id}")  # Debug log
         return MemoryResponse(
@@ -1259,7 +1275,9 @@ async def get_memory_stats(
             "total_memories": total_memories,
             "recent_memories_7_days": recent_count,
             "memories_by_type": {row["type"]: row["count"] for row in type_counts},
-            "embedding_stats": embedding_stats
+            "embedding_stats": embedding_stats,
+            "groq_stats": groq_client.stats(),
+            "summary_queue": summary_queue_worker.stats()
         }
         
     except Exception as e:
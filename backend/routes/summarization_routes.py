@@ -3,6 +3,7 @@ Summarization API Routes - Generate human-friendly narratives from search result
 Uses Gemini AI for natural language generation
 """
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import json
@@ -12,10 +13,17 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from auth.dependencies import get_current_user
+from db.postgresql_connector import PostgreSQLConnector
+from routes.memory_routes import get_postgres_db
 from utils.gemini_summarizer import gemini_summarizer
 
 summarization_router = APIRouter()
 
+def _stamp_user(memory: Dict, current_user: Dict) -> Dict:
+    """Tag a client-supplied memory with the caller, so background summaries stay per user"""
+    return {**memory, "user_id": current_user["user_id"]}
+
 def format_date(timestamp) -> str:
     """Format timestamp to human-readable date"""
     try:
@@ -168,7 +176,7 @@ def summarize_voice_memory(memory: Dict) -> str:
     return summary
 
 @summarization_router.post("/summarize_search")
-async def summarize_search_results(request: Dict[str, Any]):
+async def summarize_search_results(request: Dict[str, Any], current_user: Dict = Depends(get_current_user)):
     """
     Generate a human-friendly summary of search results using Gemini AI
     
@@ -181,7 +189,7 @@ async def summarize_search_results(request: Dict[str, Any]):
     """
     try:
         query = request.get('query', '')
-        memories = request.get('memories', [])
+        memories = [_stamp_user(m, current_user) for m in request.get('memories', [])]
         total_found = request.get('total_found', len(memories))
         
         if not memories:
@@ -194,7 +202,7 @@ async def summarize_search_results(request: Dict[str, Any]):
         
         # Use Gemini AI to generate summaries
         print(f"🤖 Using Gemini AI to summarize {len(memories)} memories for query: '{query}'")
-        result = gemini_summarizer.summarize_search_results(query, memories)
+        result = await gemini_summarizer.summarize_search_results(query, memories)
         
         return result
         
@@ -203,13 +211,14 @@ async def summarize_search_results(request: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=f"Summarization failed: {str(e)}")
 
 @summarization_router.post("/summarize_memory")
-async def summarize_single_memory(memory: Dict[str, Any]):
+async def summarize_single_memory(memory: Dict[str, Any], current_user: Dict = Depends(get_current_user)):
     """
     Generate a human-friendly summary of a single memory using Gemini AI
     """
     try:
+        memory = _stamp_user(memory, current_user)
         print(f"🤖 Using Gemini AI to summarize memory {memory.get('id')}")
-        summary = gemini_summarizer.summarize_memory(memory)
+        summary = await gemini_summarizer.summarize_memory_async(memory)
         
         return {
             "memory_id": memory.get('id'),
@@ -222,3 +231,64 @@ async def summarize_single_memory(memory: Dict[str, Any]):
     except Exception as e:
         print(f"❌ Memory summarization error: {e}")
         raise HTTPException(status_code=500, detail=f"Summarization failed: {str(e)}")
+
+def _sse(event: str, data) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@summarization_router.post("/summarize_search/stream")
+async def stream_search_summary(request: Dict[str, Any], current_user: Dict = Depends(get_current_user)):
+    """
+    Stream the search summary as server-sent events
+
+    Emits `intro` events (text chunks) as soon as Gemini produces them, then one
+    `memory_summaries` event with the per-memory summaries, then `done`.
+    """
+    query = request.get('query', '')
+    memories = [_stamp_user(m, current_user) for m in request.get('memories', [])]
+
+    async def events():
+        if not memories:
+            yield _sse("intro", f"I couldn't find any memories matching '{query}'. Try a different search term or add more memories!")
+            yield _sse("memory_summaries", [])
+            yield _sse("done", {"total_found": 0, "query": query})
+            return
+        async for item in gemini_summarizer.stream_search_summary(query, memories):
+            yield _sse(item["event"], item["data"])
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@summarization_router.post("/summarize_memory/stream")
+async def stream_single_memory_summary(memory: Dict[str, Any], current_user: Dict = Depends(get_current_user)):
+    """Stream a single memory summary as server-sent `summary` events"""
+    memory = _stamp_user(memory, current_user)
+    async def events():
+        async for text in gemini_summarizer.stream_memory_summary(memory):
+            yield _sse("summary", text)
+        yield _sse("done", {"memory_id": memory.get('id')})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@summarization_router.get("/memories/{memory_id}/summary")
+async def get_background_summary(
+    memory_id: int,
+    current_user: Dict = Depends(get_current_user),
+    postgres_db: PostgreSQLConnector = Depends(get_postgres_db)
+):
+    """
+    Poll for a Gemini summary that was finished in the background (own memories only)
+
+    Search responses use the rule-based summary when Gemini is slow or fails;
+    the Gemini result becomes available here once ready.
+    """
+    memory = await postgres_db.get_memory_by_id(memory_id)
+    if not memory:
+        raise HTTPException(status_code=404, detail="Memory not found")
+    if memory.get("user_id") != current_user["user_id"]:
+        raise HTTPException(status_code=403, detail="Access denied: You can only access your own memories")
+    return gemini_summarizer.get_background_summary(memory_id, current_user["user_id"])
+
+@summarization_router.get("/summarization_metrics")
+async def summarization_metrics(current_user: Dict = Depends(get_current_user)):
+    """Gemini summary cache and bypass counters"""
+    return {"cache": gemini_summarizer.cache.stats(), "bypassed": gemini_summarizer.bypassed}
@@ -0,0 +1,106 @@
+"""
+Test the semantic search paths: fast-index scores on the main collection's scale,
+and hybrid search encoding the query once
+(in-memory stand-ins for the ChromaDB collections; no database needed)
+"""
+import sys
+import asyncio
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, '.')
+
+from utils.embeddings import EmbeddingProcessor
+
+rng = np.random.default_rng(0)
+VECTORS = rng.standard_normal((6, 16)).astype(np.float32)
+VECTORS /= np.linalg.norm(VECTORS, axis=1, keepdims=True)
+IDS = [f"memory_{i}_x" for i in range(len(VECTORS))]
+QUERY = VECTORS[0] + 0.3 * VECTORS[1]
+
+
+class _Encoder:
+    """Same vectors for both models, so both paths should agree exactly"""
+    calls = 0
+
+    def encode(self, text):
+        _Encoder.calls += 1
+        if isinstance(text, list):
+            return np.stack([QUERY / np.linalg.norm(QUERY) for _ in text])
+        return QUERY / np.linalg.norm(QUERY)
+
+
+class _Collection:
+    def __init__(self, space):
+        self.space = space
+        self.document_filters = []
+
+    def query(self, query_embeddings, n_results, include, where_document=None):
+        self.document_filters.append(where_document)
+        q = np.asarray(query_embeddings[0], dtype=np.float32)
+        if self.space == "l2":
+            distances = ((VECTORS - q) ** 2).sum(axis=1)
+        else:
+            distances = 1.0 - VECTORS @ q
+        order = np.argsort(distances)[:n_results]
+        return {
+            "ids": [[IDS[i] for i in order]],
+            "distances": [[float(distances[i]) for i in order]],
+            "metadatas": [[{"memory_id": i} for i in order]],
+        }
+
+    def get(self, ids, include):
+        return {"ids": ids, "embeddings": [VECTORS[IDS.index(i)].tolist() for i in ids]}
+
+
+def _processor(rerank: bool) -> EmbeddingProcessor:
+    processor = EmbeddingProcessor()
+    processor.embedding_model = processor.fast_model = _Encoder()
+    processor.collection = _Collection("l2")
+    processor.fast_collection = _Collection("cosine")
+    processor.fast_rerank_enabled = rerank
+    return processor
+
+
+def _scores(processor: EmbeddingProcessor, fast: bool):
+    processor._fast_index_ready = fast
+    hits = asyncio.run(processor.search_similar_memories("query", limit=6, threshold=-1.0))
+    return {hit["memory_id"]: hit["similarity"] for hit in hits}
+
+
+def test_fast_path_matches_main_path():
+    for rerank in (False, True):
+        processor = _processor(rerank)
+        main, fast = _scores(processor, fast=False), _scores(processor, fast=True)
+        assert main.keys() == fast.keys()
+        for memory_id, similarity in main.items():
+            assert abs(similarity - fast[memory_id]) < 1e-3, (rerank, memory_id)
+
+
+def test_hybrid_search_encodes_query_once():
+    processor = _processor(rerank=False)
+    _Encoder.calls = 0
+    asyncio.run(processor.hybrid_search_memories("Team meeting about budgets", limit=20))
+    assert _Encoder.calls == 1
+
+
+def test_keyword_scan_only_runs_when_semantic_pass_is_short():
+    processor = _processor(rerank=False)
+    asyncio.run(processor.hybrid_search_memories("Team meeting about budgets", limit=2))
+    assert processor.collection.document_filters == [None]
+    asyncio.run(processor.hybrid_search_memories("Team meeting about budgets", limit=20))
+    assert processor.collection.document_filters[1:] == [
+        None, {"$or": [{"$contains": "budgets"}, {"$contains": "meeting"}]}
+    ]
+
+
+def test_keyword_filter_is_lowercase():
+    where_document = _processor(rerank=False)._keyword_document_filter("MEETING about Budgets")
+    assert where_document == {"$or": [{"$contains": "budgets"}, {"$contains": "meeting"}]}
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -2,6 +2,7 @@
 Test Gemini AI Summarization
 """
 import sys
+import asyncio
 import os
 from datetime import datetime, timedelta
 
@@ -68,7 +69,7 @@ def test_gemini():
         }
     ]
     
-    result = gemini_summarizer.summarize_search_results("meeting", test_memories)
+    result = asyncio.run(gemini_summarizer.summarize_search_results("meeting", test_memories))
     
     print(f"\n📖 Search Summary:")
     print("-" * 70)
@@ -0,0 +1,98 @@
+"""
+Test ImageProcessor preprocessing (no Tesseract binary needed)
+"""
+import sys
+import asyncio
+import io
+import json
+from unittest.mock import patch
+import cv2
+import numpy as np
+from PIL import Image
+
+# Add parent directory to path
+sys.path.insert(0, '.')
+
+from utils.image_processor import (
+    BoundingBoxes, ImageProcessor, _image_stats, _image_stats_numpy, _shape_boxes, _shape_boxes_numpy
+)
+
+processor = ImageProcessor()
+
+
+def _text_image(background: int, ink: int) -> np.ndarray:
+    gray = np.full((400, 800), background, np.uint8)
+    cv2.putText(gray, "Meeting at 10am", (40, 200), cv2.FONT_HERSHEY_SIMPLEX, 2, ink, 3)
+    return gray
+
+
+def test_dark_background_text_not_blank():
+    binary = processor._binarize(_text_image(background=30, ink=230))
+    assert not processor._is_blank(binary)
+
+
+def test_light_background_text_not_blank():
+    binary = processor._binarize(_text_image(background=240, ink=20))
+    assert not processor._is_blank(binary)
+
+
+def test_blank_pages_are_blank():
+    for value in (255, 0, 128):
+        binary = processor._binarize(np.full((600, 800), value, np.uint8))
+        assert processor._is_blank(binary), value
+
+
+def test_median_reduces_speckle():
+    gray = _text_image(background=240, ink=20)
+    speckled = gray.copy()
+    speckled[np.random.default_rng(4).random(gray.shape) < 0.002] = 0
+    with patch.object(cv2, "medianBlur", lambda image, size: image):
+        unfiltered = processor._binarize(speckled)
+    clean = processor._binarize(gray)
+    speckle_left = np.count_nonzero(processor._binarize(speckled) != clean)
+    assert speckle_left < 0.7 * np.count_nonzero(unfiltered != clean)
+
+
+def test_image_stats_matches_numpy():
+    rng = np.random.default_rng(2)
+    img = rng.integers(0, 256, (120, 90), dtype=np.uint8)
+    masks = [(rng.random((120, 90)) > p).astype(np.uint8) * 255 for p in (0.9, 0.95, 0.97)]
+    assert np.allclose(_image_stats(img, *masks), _image_stats_numpy(img, *masks))
+
+
+def test_shape_boxes_matches_numpy():
+    rng = np.random.default_rng(3)
+    conf = rng.integers(-1, 100, 50).astype(np.int32)
+    coords = rng.random((4, 50)) * 500
+    for got, expected in zip(_shape_boxes(conf, coords, 0.5, 30), _shape_boxes_numpy(conf, coords, 0.5, 30)):
+        assert np.allclose(got, expected)
+
+
+def test_ocr_result_is_json_and_cache_reads_copy():
+    ocr = ImageProcessor()
+    boxes = BoundingBoxes(["Meeting"], np.array([0.9]), *np.array([[4], [5], [60], [20]], np.int32))
+    found = {"text": "Meeting", "confidence": 0.9, "word_count": 1, "language": "eng", "bounding_boxes": boxes}
+    buffer = io.BytesIO()
+    Image.fromarray(_text_image(background=240, ink=20)).save(buffer, format="PNG")
+    with patch.object(ocr, "_extract_text_sync", return_value=found):
+        first = asyncio.run(ocr.process_image_bytes(buffer.getvalue()))
+    assert json.loads(json.dumps(first))["bounding_boxes"][0]["left"] == 4
+    first["bounding_boxes"].clear()
+    second = asyncio.run(ocr.process_image_bytes(buffer.getvalue()))
+    assert second["bounding_boxes"] == [
+        {"text": "Meeting", "confidence": 0.9, "left": 4, "top": 5, "width": 60, "height": 20}
+    ]
+
+
+def test_blank_page_skips_ocr():
+    image = Image.fromarray(np.full((600, 800), 255, np.uint8))
+    result = asyncio.run(processor.extract_text_from_pil(image, skip_if_no_text=True))
+    assert result["skipped"] == "blank_image"
+    assert result["text"] == ""
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
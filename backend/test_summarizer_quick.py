@@ -2,6 +2,7 @@
 Quick test for summarization (works with or without Gemini)
 """
 import sys
+import asyncio
 sys.path.insert(0, '.')
 
 from datetime import datetime, timedelta
@@ -45,7 +46,7 @@ else:
 print("\n2️⃣ Testing search summarization...")
 print("-" * 70)
 
-result = gemini_summarizer.summarize_search_results("meeting", test_memories)
+result = asyncio.run(gemini_summarizer.summarize_search_results("meeting", test_memories))
 
 print(f"\n📖 Summary:")
 print(result['summary'])
@@ -0,0 +1,189 @@
+"""
+Offline tests for GeminiSummarizer helpers (no Gemini API key needed)
+"""
+import sys
+import asyncio
+import orjson
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, '.')
+
+from utils.gemini_summarizer import GeminiSummarizer, SummaryQueueWorker
+
+memory = {
+    "id": 7,
+    "type": "text",
+    "raw_text": "Had coffee with John at Starbucks to discuss the new AI project",
+    "timestamp": "2025-03-04T10:00:00",
+    "sentiments": [{"label": "positive", "score": 0.85}],
+    "entities": [{"entity": "John", "type": "PERSON"}],
+}
+
+
+def test_stored_summary_is_served():
+    summarizer = GeminiSummarizer()
+    stored = dict(memory, summary="You met John for coffee.")
+    assert asyncio.run(summarizer.summarize_memory_async(stored)) == "You met John for coffee."
+    assert asyncio.run(summarizer.summarize_memories_batch([stored])) == ["You met John for coffee."]
+    
+    async def stream():
+        return [text async for text in summarizer.stream_memory_summary(stored)]
+    assert asyncio.run(stream()) == ["You met John for coffee."]
+
+
+def test_stored_prompt_uses_absolute_date():
+    prompt = GeminiSummarizer()._build_memory_prompt(memory, absolute_date=True)
+    assert "Time: on March 4, 2025" in prompt
+
+
+def test_summary_queue_is_opt_in():
+    summarizer = GeminiSummarizer()
+    worker = SummaryQueueWorker(summarizer)
+    assert not worker.enabled
+    assert worker._semaphore is not summarizer._semaphore
+
+
+def _slow_summarizer(delay_s: float, text: str) -> GeminiSummarizer:
+    """Initialized summarizer whose Gemini calls take delay_s and return text"""
+    summarizer = GeminiSummarizer()
+    summarizer.is_initialized = True
+    summarizer.request_timeout_s = 0.05
+    
+    async def _generate(prompt, generation_config=None):
+        await asyncio.sleep(delay_s)
+        return SimpleNamespace(text=text)
+    summarizer.model = SimpleNamespace(generate_content_async=_generate)
+    return summarizer
+
+
+def test_slow_batch_falls_back_then_fills_cache():
+    summarizer = _slow_summarizer(0.2, orjson.dumps([{"id": 0, "summary": "You met John."}]).decode())
+    
+    async def run():
+        first = await summarizer.summarize_memories_batch([memory])
+        await asyncio.sleep(0.3)
+        return first, await summarizer.summarize_memories_batch([memory])
+    first, second = asyncio.run(run())
+    assert first == [summarizer._fallback_summary(memory)]
+    assert second == ["You met John."]
+
+
+def test_slow_search_summary_falls_back_then_fills_cache():
+    response = {"intro": "Found 1 memory.", "summaries": [{"id": 0, "summary": "You met John."}]}
+    summarizer = _slow_summarizer(0.2, orjson.dumps(response).decode())
+    
+    async def run():
+        first = await summarizer.summarize_search_results("coffee", [memory])
+        await asyncio.sleep(0.3)
+        return first, await summarizer.summarize_memories_batch([memory])
+    first, cached = asyncio.run(run())
+    assert first["summary"] == summarizer._fallback_intro("coffee", [memory])
+    assert first["memory_summaries"][0]["summary"] == summarizer._fallback_summary(memory)
+    assert cached == ["You met John."]
+
+
+def test_json_string_entities_reach_gemini():
+    response = {"intro": "Found 1 memory.", "summaries": [{"id": 0, "summary": "You met John."}]}
+    summarizer = _slow_summarizer(0, orjson.dumps(response).decode())
+    row = dict(memory, entities=orjson.dumps(memory["entities"]).decode(), sentiments="not json")
+    result = asyncio.run(summarizer.summarize_search_results("coffee", [row]))
+    assert result["summary"] == "Found 1 memory."
+    assert result["memory_summaries"][0]["summary"] == "You met John."
+
+
+def test_combined_call_error_falls_back_per_memory():
+    summarizer = _slow_summarizer(0, "")
+    
+    async def _generate(prompt, generation_config=None):
+        config = generation_config or {}
+        if 'response_schema' in config:
+            raise RuntimeError("Gemini HTTP 503")  # not a parse error
+        if config:
+            return SimpleNamespace(text=orjson.dumps([{"id": 0, "summary": "You met John."}]).decode())
+        return SimpleNamespace(text="Found 2 memories.")
+    summarizer.model = SimpleNamespace(generate_content_async=_generate)
+    
+    stored = dict(memory, id=9, raw_text="Lunch with Maria", summary="You had lunch with Maria.")
+    result = asyncio.run(summarizer.summarize_search_results("coffee", [stored, memory]))
+    assert result["summary"] == "Found 2 memories."
+    assert [m["summary"] for m in result["memory_summaries"]] == ["You had lunch with Maria.", "You met John."]
+
+
+def test_combined_fallback_counts_each_memory_once():
+    summarizer = _slow_summarizer(0, "")
+    
+    async def _generate(prompt, generation_config=None):
+        config = generation_config or {}
+        if 'response_schema' in config:
+            return SimpleNamespace(text="not json")  # combined call unusable
+        if config:
+            return SimpleNamespace(text=orjson.dumps([{"id": 0, "summary": "You met John."}]).decode())
+        return SimpleNamespace(text="Found 2 memories.")
+    summarizer.model = SimpleNamespace(generate_content_async=_generate)
+    
+    trivial = {"id": 8, "type": "text", "raw_text": "ok", "timestamp": memory["timestamp"]}
+    result = asyncio.run(summarizer.summarize_search_results("coffee", [trivial, memory]))
+    assert result["summary"] == "Found 2 memories."
+    assert result["memory_summaries"][1]["summary"] == "You met John."
+    assert summarizer.bypassed == 1
+    assert summarizer.cache.misses == 1
+
+
+def test_background_summaries_are_per_user_and_always_cached():
+    summarizer = _slow_summarizer(0.2, "You met John.")
+    mine = dict(memory, user_id=1)
+    edited = dict(mine, raw_text="Had coffee with John again")  # same id, already pending
+    
+    async def run():
+        await asyncio.gather(summarizer.summarize_memory_async(mine), summarizer.summarize_memory_async(edited))
+        await asyncio.sleep(0.3)
+        return await asyncio.gather(summarizer.summarize_memory_async(mine), summarizer.summarize_memory_async(edited))
+    assert asyncio.run(run()) == ["You met John.", "You met John."]
+    assert not summarizer._background_tasks and not summarizer._pending
+    assert summarizer.get_background_summary(7, user_id=1)["status"] == "ready"
+    assert summarizer.get_background_summary(7, user_id=2)["status"] == "unknown"
+
+
+def test_stream_releases_semaphore_before_client_reads():
+    summarizer = _slow_summarizer(0, "")
+    
+    async def _chunks():
+        for text in ("You met ", "John."):
+            yield SimpleNamespace(text=text)
+    
+    async def _generate(prompt, stream=False):
+        return _chunks()
+    summarizer.model = SimpleNamespace(generate_content_async=_generate)
+    
+    async def run():
+        stream = summarizer.stream_memory_summary(memory)
+        first = await stream.__anext__()
+        await asyncio.sleep(0.01)  # client is slow; the reader finishes meanwhile
+        free_slots = summarizer._semaphore._value
+        rest = [text async for text in stream]
+        return [first] + rest, free_slots
+    chunks, free_slots = asyncio.run(run())
+    assert chunks == ["You met ", "John."]
+    assert free_slots == summarizer.concurrency
+
+
+def test_missing_api_key_is_memoized_until_reset():
+    summarizer = GeminiSummarizer()
+    summarizer.gemini_available = True
+    with patch.dict("os.environ", {"GEMINI_API_KEY": ""}), \
+         patch("utils.gemini_summarizer.load_dotenv") as load:
+        assert not summarizer.initialize()
+        assert not summarizer.initialize()
+        assert load.call_count == 1
+        summarizer.reset()
+        assert not summarizer.initialize()
+        assert load.call_count == 2
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -9,14 +9,29 @@ from typing import List, Dict, Any, Optional
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import os
-import uuid
+from collections import OrderedDict
+import itertools
+import secrets
+
+try:
+    from model2vec import StaticModel
+    MODEL2VEC_AVAILABLE = True
+except ImportError:
+    MODEL2VEC_AVAILABLE = False
 
 class EmbeddingProcessor:
+    # Rows fetched per ChromaDB round trip when streaming the whole collection
+    CLUSTER_CHUNK_SIZE = 10000
+    # Candidates pulled from the static-model index before BGE reranking
+    FAST_CANDIDATES = 50
+
     def __init__(self):
         self.chroma_client = None
         self.collection = None
         self.embedding_model = None
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        # One encode at a time (torch parallelizes internally); ChromaDB IO runs separately
+        self._encode_executor = ThreadPoolExecutor(max_workers=1)
+        self._io_executor = ThreadPoolExecutor(max_workers=4)
         self._init_lock = asyncio.Lock()
         # Primary: BGE-base, Fallback: MiniLM
         self.primary_model = "BAAI/bge-base-en-v1.5"
@@ -27,6 +42,26 @@ class EmbeddingProcessor:
         self.image_collection_name = "image_embeddings"
         self.collection = None  # Text embeddings collection
         self.image_collection = None  # Image embeddings collection
+        # Optional first-stage retriever: Model2Vec static embeddings in a parallel collection
+        self.fast_model_name = os.getenv("FAST_EMBEDDING_MODEL", "minishlab/potion-base-8M")
+        self.fast_query_enabled = MODEL2VEC_AVAILABLE and os.getenv("FAST_QUERY_EMBEDDINGS", "0") == "1"
+        self.fast_rerank_enabled = os.getenv("FAST_QUERY_RERANK", "1") == "1"
+        self.fast_model = None
+        self.fast_collection_name = "text_embeddings_fast"
+        self.fast_collection = None
+        self._fast_index_ready = False
+        # Side cache of stored BGE vectors (embedding_id -> float16 vector) used for reranking;
+        # float16 halves the cache footprint and is upcast to float32 on read
+        self._rerank_cache = OrderedDict()
+        self.rerank_cache_size = int(os.getenv("RERANK_CACHE_SIZE", "10000"))
+        # Embedding ids: random per-process prefix + counter (no uuid4 per row)
+        self._id_prefix = secrets.token_hex(4)
+        self._id_counter = itertools.count()
+        # Opt-in background query (every INDEX_HEARTBEAT_S seconds, 0 = off) that keeps
+        # the HNSW index pages resident between user queries on idle deployments
+        self.heartbeat_interval_s = float(os.getenv("INDEX_HEARTBEAT_S", "0"))
+        self._heartbeat_task = None
+        self._warmup_vec = None
 
     async def initialize(self):
         """Initialize ChromaDB and embedding model"""
@@ -95,7 +130,7 @@ class EmbeddingProcessor:
                 try:
                     print(f"🔄 Loading primary embedding model: {self.primary_model}")
                     self.embedding_model = await loop.run_in_executor(
-                        self.executor,
+                        self._encode_executor,
                         lambda: _load_model(self.primary_model)
                     )
                     print(f"✅ Primary embedding model loaded: {self.primary_model}")
@@ -104,19 +139,196 @@ class EmbeddingProcessor:
                 except Exception as e:
                     print(f"⚠️ Primary model failed: {e}, falling back to {self.fallback_model}")
                     self.embedding_model = await loop.run_in_executor(
-                        self.executor,
+                        self._encode_executor,
                         lambda: _load_model(self.fallback_model)
                     )
                     print(f"✅ Fallback embedding model loaded: {self.fallback_model}")
                     self.model_name = self.fallback_model
                     self.current_model = self.fallback_model
 
+                if self.fast_query_enabled:
+                    await self._initialize_fast_index()
+
+                if self.heartbeat_interval_s > 0 and self._heartbeat_task is None:
+                    dim = self.embedding_model.get_sentence_embedding_dimension()
+                    warmup = np.random.default_rng().standard_normal(dim).astype(np.float32)
+                    self._warmup_vec = (warmup / np.linalg.norm(warmup)).tolist()
+                    self._heartbeat_task = asyncio.create_task(self._index_heartbeat())
+
                 print(f"✅ Embedding processor initialized successfully with model: {self.current_model}")
 
             except Exception as e:
                 print(f"❌ Failed to initialize embedding processor: {e}")
                 raise
 
+    async def _index_heartbeat(self):
+        """Touch the text index periodically so the first query after idle isn't cold"""
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(self.heartbeat_interval_s)
+            try:
+                count = await loop.run_in_executor(self._io_executor, self.collection.count)
+                if count:
+                    await loop.run_in_executor(
+                        self._io_executor,
+                        lambda: self.collection.query(
+                            query_embeddings=[self._warmup_vec],
+                            n_results=1,
+                            include=[]
+                        )
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Index heartbeat failed: {e}")
+
+    async def _initialize_fast_index(self):
+        """Load the static embedding model and its parallel collection"""
+        try:
+            loop = asyncio.get_event_loop()
+            print(f"🔄 Loading fast query embedding model: {self.fast_model_name}")
+            self.fast_model = await loop.run_in_executor(
+                self._encode_executor,
+                lambda: StaticModel.from_pretrained(self.fast_model_name)
+            )
+            self.fast_collection = self.chroma_client.get_or_create_collection(
+                name=self.fast_collection_name,
+                metadata={"description": f"Static query embeddings for first-stage retrieval ({self.fast_model_name})",
+                          "hnsw:space": "cosine"}
+            )
+            # Only serve queries from the fast index once it covers every stored memory
+            self._fast_index_ready = self.fast_collection.count() >= self.collection.count()
+            if not self._fast_index_ready:
+                print("⚠️ Fast index is behind the text collection; call rebuild_fast_index() to backfill")
+            print(f"✅ Fast query embedding model loaded: {self.fast_model_name}")
+        except Exception as e:
+            print(f"⚠️ Fast query embeddings unavailable: {e}")
+            self.fast_model = None
+            self.fast_collection = None
+            self._fast_index_ready = False
+
+    async def _create_fast_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Encode texts with the static model (gather + mean pooling, no transformer pass)"""
+        loop = asyncio.get_event_loop()
+        embeddings = await loop.run_in_executor(
+            self._encode_executor,
+            self.fast_model.encode,
+            texts
+        )
+        return embeddings.tolist()
+
+    async def rebuild_fast_index(self) -> int:
+        """Backfill the fast collection from the documents in the text collection"""
+        if not self.collection:
+            await self.initialize()
+        if not self.fast_model or not self.fast_collection:
+            return 0
+        
+        loop = asyncio.get_event_loop()
+        total = await loop.run_in_executor(self._io_executor, self.collection.count)
+        indexed = 0
+        for offset in range(0, total, self.CLUSTER_CHUNK_SIZE):
+            chunk = await loop.run_in_executor(
+                self._io_executor,
+                lambda: self.collection.get(
+                    limit=self.CLUSTER_CHUNK_SIZE,
+                    offset=offset,
+                    include=["documents", "metadatas"]
+                )
+            )
+            if not chunk["ids"]:
+                break
+            documents = [doc or "" for doc in chunk["documents"]]
+            embeddings = await self._create_fast_embeddings(documents)
+            await loop.run_in_executor(
+                self._io_executor,
+                lambda: self.fast_collection.upsert(
+                    ids=chunk["ids"],
+                    embeddings=embeddings,
+                    metadatas=[
+                        {**(meta or {}), "preview": (meta or {}).get("preview") or self._make_preview(doc)}
+                        for meta, doc in zip(chunk["metadatas"], documents)
+                    ]
+                )
+            )
+            indexed += len(chunk["ids"])
+        
+        self._fast_index_ready = True
+        print(f"✅ Fast index rebuilt: {indexed} embeddings")
+        return indexed
+
+    async def _get_rerank_vectors(self, embedding_ids: List[str]) -> Dict[str, np.ndarray]:
+        """Fetch stored BGE vectors for embedding ids, served from the side cache when possible"""
+        vectors = {}
+        missing = []
+        for embedding_id in embedding_ids:
+            vector = self._rerank_cache.get(embedding_id)
+            if vector is None:
+                missing.append(embedding_id)
+            else:
+                self._rerank_cache.move_to_end(embedding_id)
+                vectors[embedding_id] = vector.astype(np.float32)
+        
+        if missing:
+            loop = asyncio.get_event_loop()
+            stored = await loop.run_in_executor(
+                self._io_executor,
+                lambda: self.collection.get(ids=missing, include=["embeddings"])
+            )
+            for embedding_id, embedding in zip(stored["ids"], stored["embeddings"]):
+                vector = np.asarray(embedding, dtype=np.float32)
+                vectors[embedding_id] = vector
+                self._rerank_cache[embedding_id] = vector.astype(np.float16)
+            while len(self._rerank_cache) > self.rerank_cache_size:
+                self._rerank_cache.popitem(last=False)
+        
+        return vectors
+
+    async def _fast_query(self, query: str, n_results: int) -> Optional[Dict]:
+        """First-stage retrieval on the static index, optionally reranked with stored BGE vectors.
+
+        Returns a ChromaDB-shaped query result so it can go through _process_query_results,
+        with distances on the text collection's scale: squared L2 between unit vectors,
+        i.e. 2 - 2cos (the fast collection itself reports cosine distance, 1 - cos).
+        """
+        fast_embedding = (await self._create_fast_embeddings([query]))[0]
+        loop = asyncio.get_event_loop()
+        results = await loop.run_in_executor(
+            self._io_executor,
+            lambda: self.fast_collection.query(
+                query_embeddings=[fast_embedding],
+                n_results=max(n_results, self.FAST_CANDIDATES),
+                include=['metadatas', 'distances']
+            )
+        )
+        if results['ids'] and results['ids'][0]:
+            results['distances'] = [[2.0 * d for d in results['distances'][0]]]
+        if not self.fast_rerank_enabled or not results['ids'] or not results['ids'][0]:
+            return results
+        
+        # Rerank the shortlist by cosine against the stored BGE vectors, so scores are
+        # the ones a main-collection query would have returned
+        query_embedding = await self.create_embedding(query)
+        if not query_embedding:
+            return results
+        candidate_ids = results['ids'][0]
+        vectors = await self._get_rerank_vectors(candidate_ids)
+        keep = [i for i, embedding_id in enumerate(candidate_ids) if embedding_id in vectors]
+        if not keep:
+            return results
+        
+        matrix = np.stack([vectors[candidate_ids[i]] for i in keep])
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        q = np.asarray(query_embedding, dtype=np.float32)
+        q /= max(float(np.linalg.norm(q)), 1e-12)
+        distances = 2.0 - 2.0 * (matrix @ q)
+        
+        return {
+            'ids': [[candidate_ids[i] for i in keep]],
+            'distances': [distances.tolist()],
+            'metadatas': [[results['metadatas'][0][i] for i in keep]]
+        }
+
     async def create_embedding(self, text: str) -> List[float]:
         """Create embedding for text"""
         if not self.embedding_model:
@@ -125,7 +337,7 @@ class EmbeddingProcessor:
         try:
             loop = asyncio.get_event_loop()
             embedding = await loop.run_in_executor(
-                self.executor,
+                self._encode_executor,
                 self.embedding_model.encode,
                 text
             )
@@ -147,92 +359,96 @@ class EmbeddingProcessor:
                 return None
             
             # Generate unique ID for ChromaDB
-            embedding_id = f"memory_{memory_id}_{uuid.uuid4().hex[:8]}"
-            
-            # Prepare metadata
-            doc_metadata = {
-                "memory_id": memory_id,
-                "text_length": len(text),
-                "timestamp": metadata.get("timestamp", ""),
-                **(metadata or {})
-            }
+            embedding_id = self._next_embedding_id(memory_id)
+            doc_metadata = self._build_metadata(memory_id, text, metadata)
             
             # Store in ChromaDB
-            self.collection.add(
-                embeddings=[embedding],
-                documents=[text],
-                metadatas=[doc_metadata],
-                ids=[embedding_id]
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(
+                self._io_executor,
+                lambda: self.collection.add(
+                    embeddings=[embedding],
+                    # Lowercased so keyword filters ($contains is case-sensitive) match
+                    # any casing; the original-case preview is kept in metadata
+                    documents=[text.lower()],
+                    metadatas=[doc_metadata],
+                    ids=[embedding_id]
+                )
             )
             
+            # Keep the parallel static-model index in sync
+            if self.fast_model and self.fast_collection:
+                fast_embedding = await self._create_fast_embeddings([text])
+                await loop.run_in_executor(
+                    self._io_executor,
+                    lambda: self.fast_collection.add(
+                        embeddings=fast_embedding,
+                        metadatas=[doc_metadata],
+                        ids=[embedding_id]
+                    )
+                )
+            
             return embedding_id
             
         except Exception as e:
             print(f"❌ Failed to store embedding: {e}")
             return None
 
+    def _next_embedding_id(self, memory_id: int) -> str:
+        """Unique ChromaDB id in the "memory_<id>_<suffix>" format"""
+        return f"memory_{memory_id}_{self._id_prefix}{next(self._id_counter):08x}"
+
+    def _build_metadata(self, memory_id: int, text: str, metadata: Optional[Dict]) -> Dict:
+        """ChromaDB metadata for a memory embedding; caller metadata overrides the defaults"""
+        doc_metadata = {"memory_id": memory_id, "text_length": len(text), "timestamp": ""}
+        if metadata:
+            doc_metadata.update(metadata)
+        # Precomputed preview so searches don't need to pull document bodies
+        doc_metadata["preview"] = self._make_preview(text)
+        return doc_metadata
+
     async def search_similar_memories(self, query: str, limit: int = 10, 
-                                     threshold: float = 0.3) -> List[Dict]:
-        """Search for similar memories using semantic similarity with enhanced filtering"""
+                                     threshold: float = 0.3,
+                                     where_document: Optional[Dict] = None,
+                                     query_embedding: Optional[List[float]] = None) -> List[Dict]:
+        """Search for similar memories using semantic similarity with enhanced filtering
+
+        where_document restricts the HNSW scan to documents matching a ChromaDB
+        document filter (e.g. {"$contains": "keyword"}). A precomputed query_embedding
+        skips encoding the query again and searches the main collection.
+        """
         if not self.collection:
             await self.initialize()
         
         try:
             print(f"🔍 Semantic search for: '{query}' (threshold: {threshold}, limit: {limit})")
             
-            # Create query embedding
-            query_embedding = await self.create_embedding(query)
-            if not query_embedding:
-                print("❌ Failed to create query embedding")
-                return []
-            
             # Search in ChromaDB with higher limit to allow for filtering
             search_limit = min(limit * 3, 100)  # Get more results for better filtering
             
-            loop = asyncio.get_event_loop()
-            results = await loop.run_in_executor(
-                self.executor,
-                lambda: self.collection.query(
-                    query_embeddings=[query_embedding],
-                    n_results=search_limit,
-                    include=['metadatas', 'distances', 'documents']
+            # The fast collection stores no documents, so document filters need the main index
+            if self._fast_index_ready and self.fast_model and where_document is None and query_embedding is None:
+                results = await self._fast_query(query, search_limit)
+            else:
+                # Create query embedding
+                if query_embedding is None:
+                    query_embedding = await self.create_embedding(query)
+                if not query_embedding:
+                    print("❌ Failed to create query embedding")
+                    return []
+                
+                loop = asyncio.get_event_loop()
+                results = await loop.run_in_executor(
+                    self._io_executor,
+                    lambda: self.collection.query(
+                        query_embeddings=[query_embedding],
+                        n_results=search_limit,
+                        where_document=where_document,
+                        include=['metadatas', 'distances']
+                    )
                 )
-            )
             
-            # Process and rank results
-            similar_memories = []
-            if results['ids'] and results['ids'][0]:
-                for i, (embedding_id, distance, metadata, document) in enumerate(zip(
-                    results['ids'][0], 
-                    results['distances'][0], 
-                    results['metadatas'][0],
-                    results['documents'][0] if results['documents'] else [None] * len(results['ids'][0])
-                )):
-                    # Convert distance to similarity (ChromaDB uses cosine distance)
-                    similarity = 1 - distance
-                    
-                    if similarity >= threshold:
-                        # Extract memory_id from metadata or embedding_id
-                        memory_id = metadata.get("memory_id")
-                        if not memory_id and embedding_id:
-                            # Try to extract from embedding_id format: "memory_123_uuid"
-                            try:
-                                memory_id = int(embedding_id.split('_')[1])
-                            except (IndexError, ValueError):
-                                continue
-                        
-                        similar_memories.append({
-                            "memory_id": memory_id,
-                            "embedding_id": embedding_id,
-                            "similarity": round(similarity, 4),
-                            "distance": round(distance, 4),
-                            "document_preview": document[:100] + "..." if document and len(document) > 100 else document,
-                            "metadata": metadata
-                        })
-            
-            # Sort by similarity and limit results
-            similar_memories.sort(key=lambda x: x["similarity"], reverse=True)
-            final_results = similar_memories[:limit]
+            final_results = self._process_query_results(results, limit, threshold)
             
             print(f"✅ Found {len(final_results)} similar memories above threshold {threshold}")
             return final_results
@@ -241,6 +457,99 @@ class EmbeddingProcessor:
             print(f"❌ Semantic search failed: {e}")
             return []
 
+    @staticmethod
+    def _make_preview(text: Optional[str]) -> Optional[str]:
+        """First 100 characters of a document, with an ellipsis when truncated"""
+        if not text:
+            return text
+        return text[:100] + "..." if len(text) > 100 else text
+
+    async def migrate_previews(self) -> int:
+        """One-time backfill of the metadata preview for rows stored before it existed"""
+        if not self.collection:
+            await self.initialize()
+        
+        loop = asyncio.get_event_loop()
+        total = await loop.run_in_executor(self._io_executor, self.collection.count)
+        updated = 0
+        for offset in range(0, total, self.CLUSTER_CHUNK_SIZE):
+            chunk = await loop.run_in_executor(
+                self._io_executor,
+                lambda: self.collection.get(
+                    limit=self.CLUSTER_CHUNK_SIZE,
+                    offset=offset,
+                    include=["documents", "metadatas"]
+                )
+            )
+            if not chunk["ids"]:
+                break
+            
+            ids, metadatas = [], []
+            for embedding_id, doc, meta in zip(chunk["ids"], chunk["documents"], chunk["metadatas"]):
+                meta = meta or {}
+                if "preview" not in meta:
+                    ids.append(embedding_id)
+                    metadatas.append({**meta, "preview": self._make_preview(doc or "")})
+            
+            if ids:
+                await loop.run_in_executor(
+                    self._io_executor,
+                    lambda: self.collection.update(ids=ids, metadatas=metadatas)
+                )
+                updated += len(ids)
+        
+        print(f"✅ Preview migration complete: {updated} embeddings updated")
+        return updated
+
+    def _process_query_results(self, results: Dict, limit: int,
+                               threshold: float) -> List[Dict]:
+        """Convert a ChromaDB query result into ranked memory hits above threshold"""
+        if not results['ids'] or not results['ids'][0]:
+            return []
+        
+        embedding_ids = results['ids'][0]
+        metadatas = results['metadatas'][0]
+        documents = results['documents'][0] if results.get('documents') else None
+        
+        # Threshold and rank in NumPy; only the surviving hits reach the Python loop
+        # (text collection: default l2 space, squared distance 2 - 2cos for unit vectors)
+        distances = np.asarray(results['distances'][0], dtype=np.float32)
+        similarities = 1.0 - distances
+        keep = np.nonzero(similarities >= threshold)[0]
+        order = keep[np.argsort(-similarities[keep], kind="stable")]
+        
+        similar_memories = []
+        for i in order:
+            embedding_id = embedding_ids[i]
+            metadata = metadatas[i]
+            
+            # Extract memory_id from metadata or embedding_id
+            memory_id = metadata.get("memory_id")
+            if not memory_id and embedding_id:
+                # Try to extract from embedding_id format: "memory_123_suffix"
+                try:
+                    memory_id = int(embedding_id.split('_')[1])
+                except (IndexError, ValueError):
+                    continue
+            
+            # Preview is stored in metadata; rows written before it existed fall back
+            # to the document when the caller asked for documents
+            preview = metadata.get("preview")
+            if preview is None and documents:
+                preview = self._make_preview(documents[i])
+            similar_memories.append({
+                "memory_id": memory_id,
+                "embedding_id": embedding_id,
+                "similarity": round(float(similarities[i]), 4),
+                "distance": round(float(distances[i]), 4),
+                "document_preview": preview,
+                "metadata": metadata
+            })
+            if len(similar_memories) >= limit:
+                break
+        
+        return similar_memories
+
     async def hybrid_search_memories(self, query: str, limit: int = 20, 
                                    semantic_weight: float = 0.6, 
                                    keyword_weight: float = 0.4) -> List[Dict]:
@@ -248,10 +557,28 @@ class EmbeddingProcessor:
         try:
             print(f"🔄 Hybrid search: '{query}' (semantic: {semantic_weight}, keyword: {keyword_weight})")
             
-            # Get semantic results
+            # Semantic pass first; the keyword-prefiltered scan only runs when it comes
+            # back thin, and only adds documents containing the most discriminative terms
+            if not self.collection:
+                await self.initialize()
+            query_embedding = None
+            if not (self._fast_index_ready and self.fast_model):
+                # Encoded once: both passes below reuse the same vector
+                query_embedding = await self.create_embedding(query) or None
             semantic_results = await self.search_similar_memories(
-                query, limit=limit, threshold=0.2
+                query, limit=limit, threshold=0.2, query_embedding=query_embedding
             )
+            where_document = self._keyword_document_filter(query) if len(semantic_results) < limit / 2 else None
+            if where_document:
+                seen = {result["embedding_id"] for result in semantic_results}
+                keyword_results = await self.search_similar_memories(
+                    query, limit=limit, threshold=0.2, where_document=where_document,
+                    query_embedding=query_embedding
+                )
+                semantic_results += [r for r in keyword_results if r["embedding_id"] not in seen]
+            
+            # Encode query terms once for every result
+            query_terms = [term.encode('utf-8', 'ignore') for term in query.lower().split()]
             
             # Create combined scoring
             hybrid_results = []
@@ -261,7 +588,7 @@ class EmbeddingProcessor:
                 
                 # Simple keyword matching score for the document preview
                 document = result.get("document_preview", "")
-                keyword_score = self._calculate_keyword_match_score(document, query)
+                keyword_score = self._calculate_keyword_match_score(document, query_terms)
                 
                 hybrid_score = (semantic_score * semantic_weight) + (keyword_score * keyword_weight)
                 
@@ -281,48 +608,74 @@ class EmbeddingProcessor:
             print(f"❌ Hybrid search failed: {e}")
             return []
 
-    def _calculate_keyword_match_score(self, text: str, query: str) -> float:
-        """Calculate keyword matching score for a text"""
-        if not text or not query:
+    def _keyword_document_filter(self, query: str) -> Optional[Dict]:
+        """Build a where_document filter from the longest 1-2 query terms (5+ chars)
+
+        Documents are stored lowercased, so lowercase terms match any casing.
+        """
+        terms = {term.strip(".,!?;:'\"()[]").lower() for term in query.split()}
+        terms = sorted((t for t in terms if len(t) >= 5), key=lambda t: (-len(t), t))[:2]
+        if not terms:
+            return None
+        if len(terms) == 1:
+            return {"$contains": terms[0]}
+        return {"$or": [{"$contains": term} for term in terms]}
+
+    def _calculate_keyword_match_score(self, text: str, query_terms: List[bytes]) -> float:
+        """Calculate keyword matching score for a text against pre-encoded query terms"""
+        if not text or not query_terms:
             return 0.0
         
-        text_lower = text.lower()
-        query_terms = query.lower().split()
+        # Lowercase once and scan as UTF-8 bytes: bytes.count / `in` go through libc's memmem
+        text_bytes = text.lower().encode('utf-8', 'ignore')
         
         score = 0.0
         for term in query_terms:
-            if term in text_lower:
-                # Exact match
-                score += 1.0
-                # Frequency bonus
-                score += text_lower.count(term) * 0.1
+            count = text_bytes.count(term)
+            if count:
+                # Exact match plus frequency bonus
+                score += 1.0 + count * 0.1
         
         # Normalize by number of query terms
-        return min(score / len(query_terms), 1.0) if query_terms else 0.0
+        return min(score / len(query_terms), 1.0)
 
     async def find_related_memories(self, memory_id: int, 
                                   limit: int = 5) -> List[Dict]:
         """Find memories related to a specific memory"""
+        if not self.collection:
+            await self.initialize()
+        
         try:
-            # Get the memory's embedding
-            memory_data = self.collection.get(
-                where={"memory_id": memory_id},
-                include=["documents", "embeddings"]
+            # Get the memory's stored embedding
+            loop = asyncio.get_event_loop()
+            memory_data = await loop.run_in_executor(
+                self._io_executor,
+                lambda: self.collection.get(
+                    where={"memory_id": memory_id},
+                    include=["embeddings"]
+                )
             )
             
-            if not memory_data["documents"]:
+            embeddings = memory_data.get("embeddings")
+            if embeddings is None or len(embeddings) == 0:
                 return []
             
-            # Use the memory's text to find similar ones
-            memory_text = memory_data["documents"][0]
-            similar = await self.search_similar_memories(
-                memory_text, 
-                limit=limit + 1  # +1 to exclude self
+            # Query with the stored vector directly instead of re-encoding the text,
+            # excluding the source memory itself
+            embedding = embeddings[0]
+            if hasattr(embedding, "tolist"):
+                embedding = embedding.tolist()
+            results = await loop.run_in_executor(
+                self._io_executor,
+                lambda: self.collection.query(
+                    query_embeddings=[embedding],
+                    n_results=limit,
+                    where={"memory_id": {"$ne": memory_id}},
+                    include=['metadatas', 'distances']
+                )
             )
             
-            # Filter out the original memory
-            related = [m for m in similar if m["memory_id"] != memory_id]
-            return related[:limit]
+            return self._process_query_results(results, limit, threshold=0.3)
             
         except Exception as e:
             print(f"❌ Related memories search failed: {e}")
@@ -348,17 +701,19 @@ class EmbeddingProcessor:
             return False
         
         try:
-            # Get IDs to delete
-            results = self.collection.get(
-                where={"memory_id": memory_id},
-                include=["documents"]
+            # Delete by filter in one call; no need to fetch ids (or documents) first.
+            # Stale rerank cache entries are harmless once the rows leave the fast index.
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(
+                self._io_executor,
+                lambda: self.collection.delete(where={"memory_id": memory_id})
             )
-            
-            if results["ids"]:
-                self.collection.delete(ids=results["ids"])
-                return True
-            
-            return False
+            if self.fast_collection:
+                await loop.run_in_executor(
+                    self._io_executor,
+                    lambda: self.fast_collection.delete(where={"memory_id": memory_id})
+                )
+            return True
             
         except Exception as e:
             print(f"❌ Failed to delete embedding: {e}")
@@ -370,10 +725,14 @@ class EmbeddingProcessor:
             await self.initialize()
         
         try:
-            count = self.collection.count()
+            loop = asyncio.get_event_loop()
+            count = await loop.run_in_executor(self._io_executor, self.collection.count)
             
             # Get sample of metadata to analyze
-            sample = self.collection.peek(limit=100)
+            sample = await loop.run_in_executor(
+                self._io_executor,
+                lambda: self.collection.peek(limit=100)
+            )
             
             stats = {
                 "total_embeddings": count,
@@ -381,21 +740,24 @@ class EmbeddingProcessor:
                 "current_model": self.current_model,
                 "primary_model": self.primary_model,
                 "fallback_model": self.fallback_model,
-                "collection_name": self.collection_name
+                "collection_name": self.text_collection_name,
+                "image_collection_name": self.image_collection_name
             }
             
-            if sample["metadatas"]:
-                # Analyze metadata
-                memory_ids = [m.get("memory_id") for m in sample["metadatas"]]
-                unique_memories = len(set(memory_ids))
-                
-                text_lengths = [m.get("text_length", 0) for m in sample["metadatas"]]
-                avg_text_length = sum(text_lengths) / len(text_lengths) if text_lengths else 0
+            metadatas = sample.get("metadatas") or []
+            if metadatas:
+                # Analyze metadata in a single pass
+                text_lengths = np.fromiter(
+                    (m.get("text_length", 0) for m in metadatas),
+                    dtype=np.int64,
+                    count=len(metadatas)
+                )
+                unique_memories = len({m.get("memory_id") for m in metadatas})
                 
                 stats.update({
                     "unique_memories": unique_memories,
-                    "avg_text_length": avg_text_length,
-                    "sample_size": len(sample["metadatas"])
+                    "avg_text_length": float(text_lengths.mean()),
+                    "sample_size": len(metadatas)
                 })
             
             return stats
@@ -412,7 +774,7 @@ class EmbeddingProcessor:
         try:
             loop = asyncio.get_event_loop()
             embeddings = await loop.run_in_executor(
-                self.executor,
+                self._encode_executor,
                 self.embedding_model.encode,
                 texts
             )
@@ -425,50 +787,87 @@ class EmbeddingProcessor:
     async def cluster_memories(self, memory_ids: List[int] = None, 
                              n_clusters: int = 5) -> Dict[str, Any]:
         """Cluster memories based on semantic similarity"""
+        if not self.collection:
+            await self.initialize()
+        
         try:
             from sklearn.cluster import KMeans
             
-            # Get embeddings
-            if memory_ids:
-                # Get specific memories
-                results = self.collection.get(
-                    where={"memory_id": {"$in": memory_ids}},
-                    include=["embeddings", "metadatas", "documents"]
-                )
-            else:
-                # Get all memories
-                results = self.collection.get(
-                    include=["embeddings", "metadatas", "documents"]
+            loop = asyncio.get_event_loop()
+            where = {"memory_id": {"$in": memory_ids}} if memory_ids else None
+            
+            # Stream embeddings in chunks into one preallocated buffer instead of
+            # materializing the whole collection (plus documents) as Python lists.
+            # The collection count is an upper bound for filtered fetches too.
+            total = await loop.run_in_executor(self._io_executor, self.collection.count)
+            embeddings = None
+            ids, metadatas = [], []
+            offset = 0
+            while offset < total:
+                chunk = await loop.run_in_executor(
+                    self._io_executor,
+                    lambda: self.collection.get(
+                        where=where,
+                        limit=self.CLUSTER_CHUNK_SIZE,
+                        offset=offset,
+                        include=["embeddings", "metadatas"]
+                    )
                 )
-            
-            if not results["embeddings"]:
+                chunk_embeddings = chunk.get("embeddings")
+                if chunk_embeddings is None or len(chunk_embeddings) == 0:
+                    break
+                
+                chunk_array = np.asarray(chunk_embeddings, dtype=np.float32)
+                if embeddings is None:
+                    embeddings = np.empty((total, chunk_array.shape[1]), dtype=np.float32)
+                n = len(ids)
+                embeddings[n:n + len(chunk_array)] = chunk_array
+                ids.extend(chunk["ids"])
+                metadatas.extend(chunk["metadatas"])
+                offset += self.CLUSTER_CHUNK_SIZE
+            
+            if not ids:
                 return {"clusters": [], "error": "No embeddings found"}
+            embeddings = embeddings[:len(ids)]
             
             # Perform clustering
-            embeddings = np.array(results["embeddings"])
             kmeans = KMeans(n_clusters=min(n_clusters, len(embeddings)), random_state=42)
             cluster_labels = kmeans.fit_predict(embeddings)
             
+            # Previews come from metadata (documents are stored lowercased); only rows
+            # written before the preview existed need their document, fetched in chunks
+            previews = {
+                embedding_id: metadata["preview"]
+                for embedding_id, metadata in zip(ids, metadatas) if metadata.get("preview")
+            }
+            missing = [embedding_id for embedding_id in ids if embedding_id not in previews]
+            for i in range(0, len(missing), self.CLUSTER_CHUNK_SIZE):
+                chunk_ids = missing[i:i + self.CLUSTER_CHUNK_SIZE]
+                docs = await loop.run_in_executor(
+                    self._io_executor,
+                    lambda: self.collection.get(ids=chunk_ids, include=["documents"])
+                )
+                for embedding_id, doc in zip(docs["ids"], docs["documents"]):
+                    doc = doc or ""
+                    previews[embedding_id] = doc[:200] + "..." if len(doc) > 200 else doc
+            
             # Organize results by cluster
             clusters = {}
-            for i, (label, metadata, doc) in enumerate(zip(
-                cluster_labels, 
-                results["metadatas"], 
-                results["documents"]
-            )):
+            for embedding_id, label, metadata in zip(ids, cluster_labels, metadatas):
+                label = int(label)
                 if label not in clusters:
                     clusters[label] = []
                 
                 clusters[label].append({
                     "memory_id": metadata["memory_id"],
-                    "text": doc[:200] + "..." if len(doc) > 200 else doc,
+                    "text": previews.get(embedding_id, ""),
                     "metadata": metadata
                 })
             
             return {
                 "clusters": [{"id": k, "memories": v} for k, v in clusters.items()],
                 "n_clusters": len(clusters),
-                "total_memories": len(results["embeddings"])
+                "total_memories": len(ids)
             }
             
         except Exception as e:
@@ -477,5 +876,9 @@ class EmbeddingProcessor:
 
     def cleanup(self):
         """Cleanup resources"""
-        if self.executor:
-            self.executor.shutdown(wait=True)
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        for executor in (self._encode_executor, self._io_executor):
+            if executor:
+                executor.shutdown(wait=True)
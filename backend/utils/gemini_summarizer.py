@@ -8,39 +8,197 @@ except ImportError:
     GEMINI_AVAILABLE = False
     print("⚠️ google-generativeai not installed. Run: pip install google-generativeai")
 
+try:
+    # The newer google-genai SDK exposes the batch API used for offline summaries
+    from google import genai as genai_sdk
+    GENAI_BATCH_AVAILABLE = True
+except ImportError:
+    GENAI_BATCH_AVAILABLE = False
+
 import os
-from typing import Dict, List, Any
+import asyncio
+import threading
+from types import SimpleNamespace
+import functools
+import time
+from typing import Dict, List, Any, AsyncIterator, Callable, Optional
+from collections import OrderedDict
 from datetime import datetime
-import json
+import orjson
 from dotenv import load_dotenv
+from utils.llm_cache import LLMCache
+from utils.http import http_client
+
+# Entity/sentiment label sets used when bucketing memory metadata
+_PLACE_TYPES = frozenset(('GPE', 'LOC'))
+_POSITIVE_LABELS = frozenset(('positive', 'joy', 'happy'))
+_NEGATIVE_LABELS = frozenset(('negative', 'sad', 'angry'))
 
-# Load environment variables
-load_dotenv()
+# JSON shape for the combined intro + per-memory summaries search call
+_SEARCH_SUMMARY_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'intro': {'type': 'STRING'},
+        'summaries': {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {'id': {'type': 'INTEGER'}, 'summary': {'type': 'STRING'}},
+                'required': ['id', 'summary'],
+            },
+        },
+    },
+    'required': ['intro', 'summaries'],
+}
+
+# Static parts of the per-memory summary prompt, built once at import
+_MEMORY_PROMPT_INTRO = "Create a detailed, comprehensive summary of this memory in 2-3 full sentences (40-50 words).\n\n"
+
+_MEMORY_PROMPT_INSTRUCTIONS = """
+
+Requirements:
+- Write 2-3 complete sentences (40-50 words total)
+- Professional but conversational tone
+- First sentence: What happened, when, and where
+- Second sentence: Key details, people involved, and specific actions or outcomes
+- Third sentence (if needed): Why it matters, emotional context, or future implications
+- Always start with "You"
+- Include specific details from the content
+- For text memories: Include relevant quotes or key phrases
+- For image memories: Describe what's visible and its significance
+- Make it feel personal and meaningful
+
+Example for text memory:
+"You had an in-depth discussion with the engineering team last Tuesday afternoon about the new API architecture and scalability challenges. The conversation covered microservices design patterns, database optimization strategies, and deployment pipelines, with John and Sarah providing valuable insights on handling high-traffic scenarios. This technical deep-dive helped clarify the roadmap for the next quarter's infrastructure improvements."
+
+Example for image memory:
+"You captured this memorable photo during your college graduation ceremony on campus last month, showing you with your classmates celebrating the completion of your degree. The image features you in your graduation gown standing with your best friends near the main auditorium, all smiling and holding diplomas after four years of hard work. This moment marked a significant milestone in your academic journey and the beginning of your professional career."
+
+Now create a detailed 2-3 sentence summary:"""
+
+# Whole per-memory prompt as one format template: a single .format() call per memory
+# (literal braces in the static text are escaped so only the header fields substitute)
+_MEMORY_PROMPT_TEMPLATE = (
+    _MEMORY_PROMPT_INTRO.replace('{', '{{').replace('}', '}}')
+    + 'Memory Type: {mem_type}\n'
+    'Time: {time_text}\n'
+    'Content: "{raw_text}"\n'
+    'Emotion: {sentiment_label} (confidence: {sentiment_score:.2f})\n'
+    'People: {people}\n'
+    'Places: {places}\n'
+    'Organizations: {orgs}'
+    + _MEMORY_PROMPT_INSTRUCTIONS.replace('{', '{{').replace('}', '}}')
+)
+
+@functools.lru_cache(maxsize=2048)
+def _format_date_cached(timestamp: str, now_minute: int) -> str:
+    """Relative date for an ISO timestamp, as seen at the given minute (epoch // 60)"""
+    try:
+        dt = datetime.fromisoformat(timestamp[:-1] + '+00:00' if timestamp.endswith('Z') else timestamp)
+        
+        # End of the minute, so timestamps from earlier in that minute are never "in the future"
+        now = datetime.fromtimestamp((now_minute + 1) * 60)
+        diff = now - dt.replace(tzinfo=None)
+        
+        if diff.days == 0:
+            return "today"
+        elif diff.days == 1:
+            return "yesterday"
+        elif diff.days < 7:
+            return f"{diff.days} days ago"
+        elif diff.days < 30:
+            weeks = diff.days // 7
+            return f"{weeks} week{'s' if weeks > 1 else ''} ago"
+        elif diff.days < 365:
+            months = diff.days // 30
+            return f"{months} month{'s' if months > 1 else ''} ago"
+        else:
+            years = diff.days // 365
+            return f"{years} year{'s' if years > 1 else ''} ago"
+    except:
+        return "some time ago"
 
 class GeminiSummarizer:
     def __init__(self):
-        self.api_key = os.getenv('GEMINI_API_KEY')
+        self.api_key = None  # read from the environment on first initialize()
         self.model = None
+        self.model_name = os.getenv('GEMINI_MODEL', 'gemini-2.0-flash-exp')
         self.is_initialized = False
+        # Set when Gemini can't be used at all (no package or no API key), so every
+        # request doesn't re-read .env and log the warning again; see reset()
+        self.unavailable = False
+        self._init_lock = threading.Lock()
         self.gemini_available = GEMINI_AVAILABLE
+        # Non-streaming async calls use the google-generativeai transport ("sdk") unless
+        # a deployment opts into the REST API over the shared httpx client ("httpx")
+        self.transport = os.getenv('GEMINI_TRANSPORT', 'sdk')
+        self.rest_base_url = os.getenv('GEMINI_BASE_URL', 'https://generativelanguage.googleapis.com/v1beta')
+        # Bounds concurrent Gemini requests across all callers (rate limiting)
+        self.concurrency = int(os.getenv('GEMINI_CONCURRENCY', '8'))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        # Row-marshaling: memories packed into one prompt, capped by size
+        self.batch_size = int(os.getenv('GEMINI_BATCH_SIZE', '8'))
+        self.batch_max_chars = int(os.getenv('GEMINI_BATCH_MAX_CHARS', '16000'))  # ~4k tokens
+        # Gemini batch API (cheaper, minutes-to-hours latency) for non-interactive summaries
+        self.batch_model = os.getenv('GEMINI_BATCH_MODEL', 'gemini-2.0-flash')
+        self.batch_poll_s = float(os.getenv('GEMINI_BATCH_POLL_S', '30'))
+        # Identical prompts (same memory, same relative date) reuse the previous summary
+        self.cache = LLMCache(
+            max_entries=int(os.getenv('GEMINI_CACHE_SIZE', '5000')),
+            ttl_s=float(os.getenv('GEMINI_CACHE_TTL_S', '86400'))
+        )
+        # User-facing calls wait at most this long; slower Gemini calls finish in the
+        # background (one task per (user_id, memory id)) and can be polled afterwards
+        self.request_timeout_s = float(os.getenv('GEMINI_REQUEST_TIMEOUT_S', '8'))
+        self._pending: Dict[Any, asyncio.Task] = {}
+        self._background_summaries = OrderedDict()
+        self._background_tasks = set()  # strong refs so unawaited background tasks aren't GC'd
+        # Stream chunks read ahead of the client; the reader holds a semaphore slot, the client never does
+        self.stream_buffer = int(os.getenv('GEMINI_STREAM_BUFFER', '256'))
+        # Memories with nothing worth an LLM call are answered by the rule-based summary
+        self.min_text_chars = int(os.getenv('GEMINI_MIN_TEXT_CHARS', '20'))
+        self.bypassed = 0
         
     def initialize(self):
-        """Initialize Gemini API"""
+        """Initialize Gemini API (idempotent; safe under concurrent first calls)"""
+        if self.is_initialized:
+            return True
+        if self.unavailable:
+            return False
+        with self._init_lock:
+            if self.is_initialized:
+                return True
+            if self.unavailable:
+                return False
+            return self._initialize_locked()
+
+    def reset(self):
+        """Forget the initialize() outcome so the next call reads the environment again"""
+        with self._init_lock:
+            self.is_initialized = False
+            self.unavailable = False
+            self.model = None
+
+    def _initialize_locked(self):
         try:
+            load_dotenv()
+            self.api_key = os.getenv('GEMINI_API_KEY')
             if not self.gemini_available:
                 print("⚠️ Gemini package not available, using fallback summaries")
+                self.unavailable = True
                 return False
                 
             if not self.api_key:
                 print("⚠️ GEMINI_API_KEY not found in environment, using fallback summaries")
                 print(f"   Current API key value: {self.api_key}")
+                self.unavailable = True
                 return False
                 
             genai.configure(api_key=self.api_key)
             # Use gemini-2.5-flash (latest model)
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            self.model = genai.GenerativeModel(self.model_name)
             self.is_initialized = True
-            print("✅ Gemini AI initialized successfully (gemini-2.0-flash-exp)")
+            print(f"✅ Gemini AI initialized successfully ({self.model_name})")
             return True
         except Exception as e:
             print(f"❌ Failed to initialize Gemini: {e}")
@@ -50,92 +208,134 @@ class GeminiSummarizer:
     
     def format_date(self, timestamp) -> str:
         """Format timestamp to human-readable date"""
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.isoformat()
+        elif not isinstance(timestamp, str):
+            return "some time ago"
+        # Results only change when "now" does, so cache per minute
+        return _format_date_cached(timestamp, int(time.time()) // 60)
+    
+    def format_absolute_date(self, timestamp) -> str:
+        """Calendar date for summaries that are stored and shown later"""
         try:
-            if isinstance(timestamp, str):
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            else:
-                dt = timestamp
-            
-            now = datetime.now()
-            diff = now - dt.replace(tzinfo=None)
-            
-            if diff.days == 0:
-                return "today"
-            elif diff.days == 1:
-                return "yesterday"
-            elif diff.days < 7:
-                return f"{diff.days} days ago"
-            elif diff.days < 30:
-                weeks = diff.days // 7
-                return f"{weeks} week{'s' if weeks > 1 else ''} ago"
-            elif diff.days < 365:
-                months = diff.days // 30
-                return f"{months} month{'s' if months > 1 else ''} ago"
-            else:
-                years = diff.days // 365
-                return f"{years} year{'s' if years > 1 else ''} ago"
-        except:
+            if not isinstance(timestamp, datetime):
+                timestamp = datetime.fromisoformat(str(timestamp).replace('Z', '+00:00'))
+            return f"on {timestamp:%B} {timestamp.day}, {timestamp.year}"
+        except ValueError:
             return "some time ago"
     
+    def _build_memory_prompt(self, memory: Dict, absolute_date: bool = False) -> str:
+        """Build the Gemini prompt for a single memory summary
+        
+        Stored summaries use absolute_date so they don't go stale ("today").
+        """
+        mem_type = memory.get('type', 'text')
+        raw_text = memory.get('raw_text', '')
+        timestamp = memory.get('timestamp')
+        sentiments = memory.get('sentiments', [])
+        entities = memory.get('entities', [])
+        
+        # Format time
+        time_text = self.format_absolute_date(timestamp) if absolute_date else self.format_date(timestamp)
+        
+        # Extract entity info in a single pass
+        people, places, orgs = [], [], []
+        for e in entities:
+            entity_type = e.get('type', '').upper()
+            if entity_type == 'PERSON':
+                people.append(e.get('entity', ''))
+            elif entity_type in _PLACE_TYPES:
+                places.append(e.get('entity', ''))
+            elif entity_type == 'ORG':
+                orgs.append(e.get('entity', ''))
+        
+        # Get sentiment
+        sentiment_label = sentiments[0].get('label', 'neutral') if sentiments else 'neutral'
+        sentiment_score = sentiments[0].get('score', 0.5) if sentiments else 0.5
+        
+        return _MEMORY_PROMPT_TEMPLATE.format(
+            mem_type=mem_type,
+            time_text=time_text,
+            raw_text=raw_text or '',
+            sentiment_label=sentiment_label,
+            sentiment_score=sentiment_score,
+            people=', '.join(people) if people else 'none',
+            places=', '.join(places) if places else 'none',
+            orgs=', '.join(orgs) if orgs else 'none',
+        )
+
+    @staticmethod
+    def _parse_list(value) -> List[Dict]:
+        """Entities/sentiments as a list of dicts (DB rows may carry them as JSON strings)"""
+        if isinstance(value, str):
+            try:
+                value = orjson.loads(value)
+            except orjson.JSONDecodeError:
+                return []
+        if not isinstance(value, list):
+            return []
+        return [item for item in value if isinstance(item, dict)]
+
+    def _normalize_memory(self, memory: Dict) -> Dict:
+        """Copy of a memory with entities and sentiments as lists, so prompts and keys can be built"""
+        if not isinstance(memory, dict):
+            return memory
+        return {
+            **memory,
+            'entities': self._parse_list(memory.get('entities')),
+            'sentiments': self._parse_list(memory.get('sentiments')),
+        }
+
+    def _local_summaries(self, memories: List[Dict]):
+        """Cache keys plus each memory's stored, trivial or cached summary (None: ask Gemini)"""
+        cache_keys = [LLMCache.make_key(self.model_name, self._build_memory_prompt(m)) for m in memories]
+        summaries = [self._stored_summary(m) or self._bypass_summary(m) or self.cache.get(key)
+                     for m, key in zip(memories, cache_keys)]
+        return cache_keys, summaries
+
+    def _is_trivial(self, memory: Dict) -> bool:
+        """True for empty memories and very short text ones"""
+        raw_text = (memory.get('raw_text') or '').strip()
+        if not raw_text and not memory.get('entities') and not memory.get('sentiments'):
+            return True
+        return memory.get('type', 'text') == 'text' and len(raw_text) < self.min_text_chars
+
+    def _stored_summary(self, memory: Dict) -> Optional[str]:
+        """Summary persisted by the ingest workers (memories.summary), if any"""
+        summary = memory.get('summary')
+        return summary if isinstance(summary, str) and summary.strip() else None
+
+    def _bypass_summary(self, memory: Dict) -> Optional[str]:
+        """Local summary for trivial memories, None when Gemini should be asked"""
+        if not self._is_trivial(memory):
+            return None
+        self.bypassed += 1
+        return self._fallback_summary(memory)
+
     def summarize_memory(self, memory: Dict) -> str:
         """Generate AI-powered summary for a single memory"""
+        memory = self._normalize_memory(memory)
+        stored = self._stored_summary(memory)
+        if stored is not None:
+            return stored
+        bypass = self._bypass_summary(memory)
+        if bypass is not None:
+            return bypass
         if not self.is_initialized:
             if not self.initialize():
                 return self._fallback_summary(memory)
         
         try:
-            mem_type = memory.get('type', 'text')
-            raw_text = memory.get('raw_text', '')
-            timestamp = memory.get('timestamp')
-            sentiments = memory.get('sentiments', [])
-            entities = memory.get('entities', [])
-            
-            # Format time
-            time_text = self.format_date(timestamp)
-            
-            # Extract entity info
-            people = [e.get('entity', '') for e in entities if e.get('type', '').upper() == 'PERSON']
-            places = [e.get('entity', '') for e in entities if e.get('type', '').upper() in ['GPE', 'LOC']]
-            orgs = [e.get('entity', '') for e in entities if e.get('type', '').upper() == 'ORG']
-            
-            # Get sentiment
-            sentiment_label = sentiments[0].get('label', 'neutral') if sentiments else 'neutral'
-            sentiment_score = sentiments[0].get('score', 0.5) if sentiments else 0.5
-            
-            # Build prompt for detailed 2-3 sentence summary
-            prompt = f"""Create a detailed, comprehensive summary of this memory in 2-3 full sentences (40-50 words).
-
-Memory Type: {mem_type}
-Time: {time_text}
-Content: "{raw_text}"
-Emotion: {sentiment_label} (confidence: {sentiment_score:.2f})
-People: {', '.join(people) if people else 'none'}
-Places: {', '.join(places) if places else 'none'}
-Organizations: {', '.join(orgs) if orgs else 'none'}
-
-Requirements:
-- Write 2-3 complete sentences (40-50 words total)
-- Professional but conversational tone
-- First sentence: What happened, when, and where
-- Second sentence: Key details, people involved, and specific actions or outcomes
-- Third sentence (if needed): Why it matters, emotional context, or future implications
-- Always start with "You"
-- Include specific details from the content
-- For text memories: Include relevant quotes or key phrases
-- For image memories: Describe what's visible and its significance
-- Make it feel personal and meaningful
-
-Example for text memory:
-"You had an in-depth discussion with the engineering team last Tuesday afternoon about the new API architecture and scalability challenges. The conversation covered microservices design patterns, database optimization strategies, and deployment pipelines, with John and Sarah providing valuable insights on handling high-traffic scenarios. This technical deep-dive helped clarify the roadmap for the next quarter's infrastructure improvements."
-
-Example for image memory:
-"You captured this memorable photo during your college graduation ceremony on campus last month, showing you with your classmates celebrating the completion of your degree. The image features you in your graduation gown standing with your best friends near the main auditorium, all smiling and holding diplomas after four years of hard work. This moment marked a significant milestone in your academic journey and the beginning of your professional career."
-
-Now create a detailed 2-3 sentence summary:"""
+            prompt = self._build_memory_prompt(memory)
+            cache_key = LLMCache.make_key(self.model_name, prompt)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
 
             # Generate summary
             response = self.model.generate_content(prompt)
             summary = response.text.strip()
+            self.cache.set(cache_key, summary)
             
             print(f"✨ Gemini generated summary for memory {memory.get('id')}")
             return summary
@@ -143,33 +343,341 @@ Now create a detailed 2-3 sentence summary:"""
         except Exception as e:
             print(f"⚠️ Gemini summarization failed: {e}, using fallback")
             return self._fallback_summary(memory)
-    
-    def summarize_search_results(self, query: str, memories: List[Dict]) -> Dict[str, Any]:
-        """Generate AI-powered summary for search results"""
+
+    async def summarize_memory_async(self, memory: Dict) -> str:
+        """Generate AI-powered summary for a single memory without blocking the event loop"""
+        memory = self._normalize_memory(memory)
+        stored = self._stored_summary(memory)
+        if stored is not None:
+            return stored
+        bypass = self._bypass_summary(memory)
+        if bypass is not None:
+            return bypass
         if not self.is_initialized:
             if not self.initialize():
-                return self._fallback_search_summary(query, memories)
+                return self._fallback_summary(memory)
         
         try:
-            # Count memory types
-            memory_types = {}
-            for memory in memories:
-                mem_type = memory.get('type', 'text')
-                memory_types[mem_type] = memory_types.get(mem_type, 0) + 1
-            
-            # Build type description
-            type_parts = []
-            if memory_types.get('image'):
-                type_parts.append(f"{memory_types['image']} image{'s' if memory_types['image'] > 1 else ''}")
-            if memory_types.get('text'):
-                type_parts.append(f"{memory_types['text']} text memor{'ies' if memory_types['text'] > 1 else 'y'}")
-            if memory_types.get('voice'):
-                type_parts.append(f"{memory_types['voice']} voice note{'s' if memory_types['voice'] > 1 else ''}")
+            prompt = self._build_memory_prompt(memory)
+            cache_key = LLMCache.make_key(self.model_name, prompt)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            call = asyncio.create_task(self._generate_async(prompt))
+            try:
+                response = await asyncio.wait_for(asyncio.shield(call), self.request_timeout_s)
+            except asyncio.TimeoutError:
+                # Don't hold the request: answer with the local summary and let the
+                # Gemini call finish in the background
+                print(f"⏱️ Gemini slow for memory {memory.get('id')}, finishing in background")
+                self._schedule_background_summary(memory, cache_key, call=call)
+                return self._fallback_summary(memory)
+            summary = response.text.strip()
+            self.cache.set(cache_key, summary)
             
-            type_text = ', '.join(type_parts) if type_parts else 'memories'
+            print(f"✨ Gemini generated summary for memory {memory.get('id')}")
+            return summary
             
-            # Create intro prompt
-            intro_prompt = f"""Create a professional, concise introduction for search results.
+        except Exception as e:
+            print(f"⚠️ Gemini summarization failed: {e}, using fallback")
+            return self._fallback_summary(memory)
+
+    async def _generate_content_async(self, prompt: str, generation_config: Optional[Dict] = None):
+        """One non-streaming Gemini call; the response exposes .text like the SDK's"""
+        if self.transport != 'httpx':
+            return await self.model.generate_content_async(prompt, generation_config=generation_config)
+        
+        body = {'contents': [{'role': 'user', 'parts': [{'text': prompt}]}]}
+        if generation_config:
+            # REST field names are camelCase (response_mime_type -> responseMimeType)
+            body['generationConfig'] = {
+                key.split('_')[0] + ''.join(part.title() for part in key.split('_')[1:]): value
+                for key, value in generation_config.items()
+            }
+        resp = await http_client.post(
+            f"{self.rest_base_url}/models/{self.model_name}:generateContent",
+            content=orjson.dumps(body),
+            headers={'x-goog-api-key': self.api_key}
+        )
+        if resp.status_code >= 400:
+            raise RuntimeError(f"Gemini HTTP {resp.status_code}: {resp.text[:200]}")
+        
+        candidates = orjson.loads(resp.content).get('candidates') or [{}]
+        parts = (candidates[0].get('content') or {}).get('parts') or []
+        text = ''.join(part.get('text', '') for part in parts)
+        if not text:
+            raise ValueError(f"Gemini returned no text (finishReason={candidates[0].get('finishReason')})")
+        return SimpleNamespace(text=text)
+
+    async def _generate_async(self, prompt: str, semaphore: Optional[asyncio.Semaphore] = None):
+        async with semaphore or self._semaphore:
+            return await self._generate_content_async(prompt)
+
+    def _schedule_background_summary(self, memory: Dict, cache_key: str,
+                                     call: Optional[asyncio.Task] = None):
+        """Finish (or retry) a Gemini summary off the request path
+
+        A timed-out call is always awaited and cached; a retry (no call) runs once per
+        (user_id, memory id). Results are polled per user, never across users.
+        """
+        key = (memory.get('user_id'), memory.get('id'))
+        if call is None and (key[1] is None or key in self._pending):
+            return
+        
+        async def _finish():
+            try:
+                response = await (call if call is not None else self._generate_async(self._build_memory_prompt(memory)))
+                summary = response.text.strip()
+                self.cache.set(cache_key, summary)
+                if key[1] is not None:
+                    self._background_summaries[key] = summary
+                    while len(self._background_summaries) > 1000:
+                        self._background_summaries.popitem(last=False)
+                print(f"✨ Gemini background summary ready for memory {key[1]}")
+            except Exception as e:
+                print(f"⚠️ Gemini background summary failed for memory {key[1]}: {e}")
+            finally:
+                if self._pending.get(key) is asyncio.current_task():
+                    del self._pending[key]
+        
+        task = asyncio.create_task(_finish())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        if key[1] is not None and key not in self._pending:
+            self._pending[key] = task
+
+    def get_background_summary(self, memory_id, user_id=None) -> Dict[str, Any]:
+        """Status of a summary that was moved off the request path, for one user"""
+        key = (user_id, memory_id)
+        if key in self._background_summaries:
+            return {"memory_id": memory_id, "status": "ready", "summary": self._background_summaries[key]}
+        if key in self._pending:
+            return {"memory_id": memory_id, "status": "pending"}
+        return {"memory_id": memory_id, "status": "unknown"}
+    
+    def _finish_in_background(self, call: asyncio.Task, on_result: Callable, what: str):
+        """Let a timed-out Gemini call complete off the request path and keep its result"""
+        async def _finish():
+            try:
+                on_result(await call)
+                print(f"✨ Gemini background {what} ready")
+            except Exception as e:
+                print(f"⚠️ Gemini background {what} failed: {e}")
+        
+        task = asyncio.create_task(_finish())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _describe_memory_for_batch(self, index: int, memory: Dict) -> str:
+        """Compact description of one memory inside a batched prompt"""
+        sentiments = memory.get('sentiments') or []
+        entities = memory.get('entities') or []
+        people, places = [], []
+        for e in entities:
+            entity_type = e.get('type', '').upper()
+            if entity_type == 'PERSON':
+                people.append(e.get('entity', ''))
+            elif entity_type in _PLACE_TYPES:
+                places.append(e.get('entity', ''))
+        sentiment_label = sentiments[0].get('label', 'neutral') if sentiments else 'neutral'
+        return (
+            f"MEMORY {index}: id={index} type={memory.get('type', 'text')} "
+            f"time={self.format_date(memory.get('timestamp'))} emotion={sentiment_label} "
+            f"people={', '.join(people) or 'none'} places={', '.join(places) or 'none'}\n"
+            f"content=\"{memory.get('raw_text', '')}\""
+        )
+
+    def _chunk_for_batches(self, memories: List[Dict]) -> List[List[int]]:
+        """Split memory indexes into batches of at most batch_size and batch_max_chars"""
+        chunks, current, size = [], [], 0
+        for i, memory in enumerate(memories):
+            length = len(memory.get('raw_text') or '') + 200
+            if current and (len(current) >= self.batch_size or size + length > self.batch_max_chars):
+                chunks.append(current)
+                current, size = [], 0
+            current.append(i)
+            size += length
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _summarize_batch_async(self, memories: List[Dict], cache_keys: List[str]) -> List[str]:
+        """Summarize several memories with a single JSON-mode Gemini call
+
+        Gemini's summaries are cached under cache_keys. Like summarize_memory_async,
+        a call slower than request_timeout_s is answered with rule-based summaries
+        and finishes (and fills the cache) in the background.
+        """
+        prompt = (
+            "Return a JSON array of summaries for each memory below. "
+            "Each element: {\"id\": <memory id>, \"summary\": <string>}.\n"
+            "Each summary is 2-3 complete sentences (40-50 words), starts with \"You\", "
+            "uses a professional but conversational tone and includes specific details from the content.\n\n"
+            + "\n---\n".join(self._describe_memory_for_batch(i, m) for i, m in enumerate(memories))
+        )
+        async def _batch():
+            async with self._semaphore:
+                return await self._generate_content_async(
+                    prompt,
+                    generation_config={'response_mime_type': 'application/json'}
+                )
+        
+        call = asyncio.create_task(_batch())
+        try:
+            response = await asyncio.wait_for(asyncio.shield(call), self.request_timeout_s)
+        except asyncio.TimeoutError:
+            print(f"⏱️ Gemini slow for a batch of {len(memories)} memories, finishing in background")
+            self._finish_in_background(
+                call, lambda response: self._parse_batch_response(response, cache_keys),
+                f"batch of {len(memories)} summaries"
+            )
+            return [self._fallback_summary(memory) for memory in memories]
+        by_id = self._parse_batch_response(response, cache_keys)
+        
+        # Anything missing from the batch response is retried individually
+        missing = [i for i in range(len(memories)) if i not in by_id]
+        if missing:
+            retried = await asyncio.gather(*[self.summarize_memory_async(memories[i]) for i in missing])
+            by_id.update(zip(missing, retried))
+        return [by_id[i] for i in range(len(memories))]
+
+    def _parse_batch_response(self, response, cache_keys: List[str]) -> Dict[int, str]:
+        """Summaries by batch index from a JSON-mode response, cached as they are read"""
+        by_id = {}
+        try:
+            for item in orjson.loads(response.text):
+                if isinstance(item, dict) and item.get('summary'):
+                    index = int(item.get('id'))
+                    if 0 <= index < len(cache_keys):
+                        by_id[index] = str(item['summary']).strip()
+                        self.cache.set(cache_keys[index], by_id[index])
+        except (ValueError, TypeError) as e:
+            print(f"⚠️ Could not parse batched Gemini response: {e}")
+        return by_id
+
+    async def summarize_memories_batch(self, memories: List[Dict]) -> List[str]:
+        """Summarize memories with row-marshaled prompts, batches running concurrently
+
+        Returns one summary per memory, in input order.
+        """
+        if not memories:
+            return []
+        
+        # Serve stored, trivial and cached summaries first; only the rest go to Gemini
+        memories = [self._normalize_memory(m) for m in memories]
+        cache_keys, summaries = self._local_summaries(memories)
+        return await self._summarize_pending(memories, cache_keys, summaries)
+
+    async def _summarize_pending(self, memories: List[Dict], cache_keys: List[str],
+                                 summaries: List[Optional[str]]) -> List[str]:
+        """Fill the None entries of summaries (in place) with batched Gemini calls"""
+        pending = [i for i, summary in enumerate(summaries) if summary is None]
+        if not pending:
+            return summaries
+        if not self.is_initialized and not self.initialize():
+            for i in pending:
+                summaries[i] = self._fallback_summary(memories[i])
+            return summaries
+        
+        chunks = [[pending[j] for j in chunk] for chunk in self._chunk_for_batches([memories[i] for i in pending])]
+        results = await asyncio.gather(
+            *[self._summarize_batch_async([memories[i] for i in chunk], [cache_keys[i] for i in chunk])
+              for chunk in chunks],
+            return_exceptions=True
+        )
+        
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ Batched Gemini summarization failed: {result}, using fallback")
+                result = [self._fallback_summary(memories[i]) for i in chunk]
+                for i in chunk:
+                    self._schedule_background_summary(memories[i], cache_keys[i])
+            for i, summary in zip(chunk, result):
+                summaries[i] = summary
+        return summaries
+
+    async def submit_batch(self, memories: List[Dict]) -> Dict[Any, str]:
+        """Summarize memories through Gemini's batch API with inline requests
+
+        Meant for background ingest/backfill only: the job can take minutes to hours.
+        Returns {memory_id: summary} for the requests that succeeded.
+        """
+        if not memories:
+            return {}
+        if not GENAI_BATCH_AVAILABLE:
+            raise RuntimeError("google-genai is not installed; batch mode unavailable")
+        if self.api_key is None:
+            self.initialize()
+        if not self.api_key:
+            raise RuntimeError("GEMINI_API_KEY is not set")
+        
+        client = genai_sdk.Client(api_key=self.api_key)
+        inline_requests = [
+            {'contents': [{'role': 'user', 'parts': [{'text': self._build_memory_prompt(memory, absolute_date=True)}]}]}
+            for memory in memories
+        ]
+        job = await asyncio.to_thread(
+            client.batches.create,
+            model=self.batch_model,
+            src=inline_requests,
+            config={'display_name': f"memory-summaries-{datetime.now():%Y%m%d%H%M%S}"}
+        )
+        print(f"📦 Submitted Gemini batch {job.name} with {len(memories)} memories")
+        
+        finished = {'JOB_STATE_SUCCEEDED', 'JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED'}
+        while job.state.name not in finished:
+            await asyncio.sleep(self.batch_poll_s)
+            job = await asyncio.to_thread(client.batches.get, name=job.name)
+        
+        if job.state.name != 'JOB_STATE_SUCCEEDED':
+            raise RuntimeError(f"Gemini batch {job.name} ended in {job.state.name}")
+        
+        summaries = {}
+        for memory, inline_response in zip(memories, job.dest.inlined_responses):
+            if inline_response.response and inline_response.response.text:
+                summaries[memory.get('id')] = inline_response.response.text.strip()
+            else:
+                print(f"⚠️ Gemini batch returned no summary for memory {memory.get('id')}: {inline_response.error}")
+        
+        print(f"✨ Gemini batch {job.name} produced {len(summaries)} summaries")
+        return summaries
+
+    def _memory_summary_entry(self, memory: Dict, summary: str) -> Dict[str, Any]:
+        """Shape a per-memory summary for the search response"""
+        return {
+            "memory_id": memory.get('id'),
+            "type": memory.get('type'),
+            "summary": summary,
+            "timestamp": memory.get('timestamp'),
+            "image_url": memory.get('image_url')
+        }
+
+    def _describe_memory_types(self, memories: List[Dict]) -> str:
+        """e.g. "2 images, 1 text memory" for the search intro"""
+        # Count memory types
+        memory_types = {}
+        for memory in memories:
+            mem_type = memory.get('type', 'text')
+            memory_types[mem_type] = memory_types.get(mem_type, 0) + 1
+        
+        # Build type description
+        type_parts = []
+        if memory_types.get('image'):
+            type_parts.append(f"{memory_types['image']} image{'s' if memory_types['image'] > 1 else ''}")
+        if memory_types.get('text'):
+            type_parts.append(f"{memory_types['text']} text memor{'ies' if memory_types['text'] > 1 else 'y'}")
+        if memory_types.get('voice'):
+            type_parts.append(f"{memory_types['voice']} voice note{'s' if memory_types['voice'] > 1 else ''}")
+        
+        return ', '.join(type_parts) if type_parts else 'memories'
+
+    def _build_intro_prompt(self, query: str, memories: List[Dict]) -> str:
+        """Build the Gemini prompt for the search results introduction"""
+        type_text = self._describe_memory_types(memories)
+        
+        # Create intro prompt
+        return f"""Create a professional, concise introduction for search results.
 
 Query: "{query}"
 Found: {len(memories)} memories ({type_text})
@@ -182,32 +690,138 @@ Examples:
 
 Now create an introduction:"""
 
-            intro_response = self.model.generate_content(intro_prompt)
-            intro = intro_response.text.strip()
+    async def _generate_intro_async(self, query: str, memories: List[Dict]) -> str:
+        """Generate the search results introduction with Gemini (raises TimeoutError past request_timeout_s)"""
+        async def _intro():
+            async with self._semaphore:
+                return await self._generate_content_async(self._build_intro_prompt(query, memories))
+        
+        response = await asyncio.wait_for(_intro(), self.request_timeout_s)
+        return response.text.strip()
+
+    async def _summarize_search_combined_async(self, query: str, memories: List[Dict],
+                                               cache_keys: List[str], summaries: List[Optional[str]]) -> str:
+        """Intro plus per-memory summaries from one JSON-mode Gemini call
+
+        Fills the None entries of summaries in place and returns the intro. Uncached
+        memories that fit one row-marshaled batch share the call with the intro;
+        any overflow goes through _summarize_pending concurrently.
+        Raises ValueError when the response can't be parsed or misses a memory.
+        A combined call slower than request_timeout_s is answered with the rule-based
+        intro and summaries and finishes (and fills the cache) in the background.
+        """
+        deadline = asyncio.get_event_loop().time() + self.request_timeout_s
+        pending = [i for i, summary in enumerate(summaries) if summary is None]
+        head = [pending[j] for j in self._chunk_for_batches([memories[i] for i in pending])[0]] if pending else []
+        rest = pending[len(head):]
+        
+        prompt = (
+            f"These memories were found for the search query \"{query}\" "
+            f"({len(memories)} memories: {self._describe_memory_types(memories)}).\n"
+            "Return a JSON object with:\n"
+            "- \"intro\": a professional 1-sentence introduction summarizing what was found, "
+            "e.g. \"Found 3 relevant memories related to your birthday celebration, including 2 images and 1 text entry.\"\n"
+            "- \"summaries\": one {\"id\": <memory id>, \"summary\": <string>} per memory below. "
+            "Each summary is 2-3 complete sentences (40-50 words), starts with \"You\", "
+            "uses a professional but conversational tone and includes specific details from the content.\n\n"
+            + "\n---\n".join(self._describe_memory_for_batch(k, memories[i]) for k, i in enumerate(head))
+        )
+        
+        async def _combined():
+            async with self._semaphore:
+                return await self._generate_content_async(
+                    prompt,
+                    generation_config={
+                        'response_mime_type': 'application/json',
+                        'response_schema': _SEARCH_SUMMARY_SCHEMA,
+                    }
+                )
+        
+        call = asyncio.create_task(_combined())
+        if rest:
+            # Bounded by its own request timeout; runs while the combined call is in flight
+            rest_summaries = await self._summarize_pending(
+                [memories[i] for i in rest], [cache_keys[i] for i in rest], [None] * len(rest)
+            )
+            for i, summary in zip(rest, rest_summaries):
+                summaries[i] = summary
+        head_keys = [cache_keys[i] for i in head]
+        try:
+            remaining = max(0.0, deadline - asyncio.get_event_loop().time())
+            response = await asyncio.wait_for(asyncio.shield(call), remaining)
+        except asyncio.TimeoutError:
+            print(f"⏱️ Gemini slow for the search summary of '{query}', finishing in background")
+            self._finish_in_background(
+                call, lambda response: self._parse_combined_response(response, head_keys),
+                f"search summary for '{query}'"
+            )
+            for i in head:
+                summaries[i] = self._fallback_summary(memories[i])
+            return self._fallback_intro(query, memories)
+        
+        intro, by_id = self._parse_combined_response(response, head_keys)
+        for k, i in enumerate(head):
+            summaries[i] = by_id[k]
+        return intro
+
+    def _parse_combined_response(self, response, head_keys: List[str]):
+        """Intro and summaries by head index from a combined response, caching the summaries
+
+        Raises ValueError when the response can't be parsed or misses a memory.
+        """
+        try:
+            data = orjson.loads(response.text)
+            intro = str(data['intro']).strip()
+            by_id = {int(item['id']): str(item['summary']).strip() for item in data['summaries']}
+        except (KeyError, TypeError, orjson.JSONDecodeError) as e:
+            raise ValueError(f"unparseable combined response: {e}")
+        if not intro or any(not by_id.get(k) for k in range(len(head_keys))):
+            raise ValueError(f"combined response covered {len(by_id)} of {len(head_keys)} memories")
+        
+        for k, key in enumerate(head_keys):
+            self.cache.set(key, by_id[k])
+        return intro, by_id
+
+    async def summarize_search_results(self, query: str, memories: List[Dict]) -> Dict[str, Any]:
+        """Generate AI-powered summary for search results
+
+        Normally a single Gemini call returns the intro and the summaries together.
+        If that call fails or its response is unusable, the intro and the batched
+        per-memory summaries are requested concurrently instead, bounded by
+        GEMINI_CONCURRENCY.
+        """
+        if not self.is_initialized:
+            if not self.initialize():
+                return self._fallback_search_summary(query, memories)
+        
+        try:
+            # Normalized and resolved once: the fallback below only asks for what's still missing
+            memories = [self._normalize_memory(m) for m in memories]
+            cache_keys, summaries = self._local_summaries(memories)
+            try:
+                intro = await self._summarize_search_combined_async(query, memories, cache_keys, summaries)
+            except Exception as e:
+                # Unusable response, HTTP or transport error: keep what was resolved locally
+                print(f"⚠️ Combined Gemini search summary failed: {e}, falling back to parallel calls")
+                # The intro only depends on counts, so it runs alongside the batched summaries
+                intro, pending = await asyncio.gather(
+                    self._generate_intro_async(query, memories),
+                    self._summarize_pending(memories, cache_keys, summaries),
+                    return_exceptions=True
+                )
+                if isinstance(pending, Exception):
+                    print(f"⚠️ Error summarizing memories: {pending}")
             
-            # Generate individual summaries
-            memory_summaries = []
-            for memory in memories:
-                try:
-                    summary = self.summarize_memory(memory)
-                    memory_summaries.append({
-                        "memory_id": memory.get('id'),
-                        "type": memory.get('type'),
-                        "summary": summary,
-                        "timestamp": memory.get('timestamp'),
-                        "image_url": memory.get('image_url')
-                    })
-                except Exception as mem_error:
-                    print(f"⚠️ Error summarizing memory {memory.get('id')}: {mem_error}")
-                    # Use fallback for this specific memory
-                    summary = self._fallback_summary(memory)
-                    memory_summaries.append({
-                        "memory_id": memory.get('id'),
-                        "type": memory.get('type'),
-                        "summary": summary,
-                        "timestamp": memory.get('timestamp'),
-                        "image_url": memory.get('image_url')
-                    })
+            if isinstance(intro, Exception):
+                print(f"⚠️ Gemini intro generation failed: {intro}, using fallback")
+                intro = self._fallback_intro(query, memories)
+            summaries = [summary if summary is not None else self._fallback_summary(memory)
+                         for memory, summary in zip(memories, summaries)]
+            
+            memory_summaries = [
+                self._memory_summary_entry(memory, summary)
+                for memory, summary in zip(memories, summaries)
+            ]
             
             print(f"✨ Gemini generated search summary for {len(memories)} memories")
             
@@ -222,6 +836,110 @@ Now create an introduction:"""
             print(f"⚠️ Gemini search summarization failed: {e}, using fallback")
             return self._fallback_search_summary(query, memories)
     
+    async def _stream_text(self, prompt: str) -> AsyncIterator[str]:
+        """Gemini stream chunks, read into a bounded queue under the semaphore
+
+        The slot is released as soon as Gemini is done, not when a slow client has
+        consumed every chunk; yields happen outside it.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.stream_buffer)
+        
+        async def _read():
+            try:
+                async with self._semaphore:
+                    response = await self.model.generate_content_async(prompt, stream=True)
+                    async for chunk in response:
+                        if chunk.text:
+                            await queue.put(chunk.text)
+                await queue.put(None)
+            except Exception as e:
+                await queue.put(e)
+        
+        reader = asyncio.create_task(_read())
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            reader.cancel()
+
+    async def stream_memory_summary(self, memory: Dict) -> AsyncIterator[str]:
+        """Yield a memory summary chunk by chunk as Gemini produces it"""
+        memory = self._normalize_memory(memory)
+        stored = self._stored_summary(memory)
+        if stored is not None:
+            yield stored
+            return
+        bypass = self._bypass_summary(memory)
+        if bypass is not None:
+            yield bypass
+            return
+        if not self.is_initialized:
+            if not self.initialize():
+                yield self._fallback_summary(memory)
+                return
+        
+        prompt = self._build_memory_prompt(memory)
+        cache_key = LLMCache.make_key(self.model_name, prompt)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        parts = []
+        try:
+            async for text in self._stream_text(prompt):
+                parts.append(text)
+                yield text
+            self.cache.set(cache_key, "".join(parts).strip())
+        except Exception as e:
+            print(f"⚠️ Gemini streaming failed: {e}, using fallback")
+            if not parts:
+                yield self._fallback_summary(memory)
+
+    async def stream_search_summary(self, query: str, memories: List[Dict]) -> AsyncIterator[Dict[str, Any]]:
+        """Stream search summary events: intro chunks first, then the per-memory summaries
+
+        Per-memory summaries are generated in the background while the intro streams.
+        Yields {"event": "intro" | "memory_summaries" | "done", "data": ...}.
+        """
+        if not self.is_initialized and not self.initialize():
+            result = self._fallback_search_summary(query, memories)
+            yield {"event": "intro", "data": result["summary"]}
+            yield {"event": "memory_summaries", "data": result["memory_summaries"]}
+            yield {"event": "done", "data": {"total_found": len(memories), "query": query}}
+            return
+        
+        summaries_task = asyncio.create_task(self.summarize_memories_batch(memories))
+        try:
+            streamed = False
+            try:
+                async for text in self._stream_text(self._build_intro_prompt(query, memories)):
+                    streamed = True
+                    yield {"event": "intro", "data": text}
+            except Exception as e:
+                print(f"⚠️ Gemini intro streaming failed: {e}, using fallback")
+            if not streamed:
+                yield {"event": "intro", "data": self._fallback_intro(query, memories)}
+            
+            try:
+                summaries = await summaries_task
+            except Exception as e:
+                print(f"⚠️ Error summarizing memories: {e}")
+                summaries = [self._fallback_summary(memory) for memory in memories]
+            yield {
+                "event": "memory_summaries",
+                "data": [self._memory_summary_entry(m, summary) for m, summary in zip(memories, summaries)]
+            }
+            yield {"event": "done", "data": {"total_found": len(memories), "query": query}}
+        finally:
+            if not summaries_task.done():
+                summaries_task.cancel()
+
     def _fallback_summary(self, memory: Dict) -> str:
         """Fallback to rule-based summary if Gemini fails"""
         try:
@@ -237,9 +955,8 @@ Now create an introduction:"""
             # Handle sentiments (can be list or JSON string)
             sentiments = memory.get('sentiments', [])
             if isinstance(sentiments, str):
-                import json
                 try:
-                    sentiments = json.loads(sentiments)
+                    sentiments = orjson.loads(sentiments)
                 except:
                     sentiments = []
             if not isinstance(sentiments, list):
@@ -248,9 +965,8 @@ Now create an introduction:"""
             # Handle entities (can be list or JSON string)
             entities = memory.get('entities', [])
             if isinstance(entities, str):
-                import json
                 try:
-                    entities = json.loads(entities)
+                    entities = orjson.loads(entities)
                 except:
                     entities = []
             if not isinstance(entities, list):
@@ -265,22 +981,26 @@ Now create an introduction:"""
                 if isinstance(sentiment, dict):
                     label = sentiment.get('label', 'neutral').lower()
                     score = sentiment.get('score', 0.5)
-                    if label in ['positive', 'joy', 'happy']:
+                    if label in _POSITIVE_LABELS:
                         emotion = "very happy" if score > 0.8 else "positive"
-                    elif label in ['negative', 'sad', 'angry']:
+                    elif label in _NEGATIVE_LABELS:
                         emotion = "reflective" if score > 0.8 else "thoughtful"
             
-            # Get key entities
+            # Get key entities (at most 2 people and 1 place), stop once both are filled
             people = []
             places = []
-            if entities:
-                for e in entities:
-                    if isinstance(e, dict):
-                        entity_type = e.get('type', '').upper()
-                        if entity_type == 'PERSON' and len(people) < 2:
-                            people.append(e.get('entity', ''))
-                        elif entity_type in ['GPE', 'LOC'] and len(places) < 1:
-                            places.append(e.get('entity', ''))
+            for e in entities:
+                if not isinstance(e, dict):
+                    continue
+                entity_type = e.get('type', '').upper()
+                if entity_type == 'PERSON':
+                    if len(people) < 2:
+                        people.append(e.get('entity', ''))
+                elif entity_type in _PLACE_TYPES:
+                    if not places:
+                        places.append(e.get('entity', ''))
+                if len(people) == 2 and places:
+                    break
             
             # Build detailed 2-3 sentence summary
             if mem_type == 'image':
@@ -359,19 +1079,8 @@ Now create an introduction:"""
             except:
                 return "Unable to generate summary for this memory."
     
-    def _fallback_search_summary(self, query: str, memories: List[Dict]) -> Dict[str, Any]:
-        """Fallback search summary if Gemini fails"""
-        memory_summaries = []
-        for memory in memories:
-            summary = self._fallback_summary(memory)
-            memory_summaries.append({
-                "memory_id": memory.get('id'),
-                "type": memory.get('type'),
-                "summary": summary,
-                "timestamp": memory.get('timestamp'),
-                "image_url": memory.get('image_url')
-            })
-        
+    def _fallback_intro(self, query: str, memories: List[Dict]) -> str:
+        """Rule-based introduction for search results"""
         # Count types
         memory_types = {}
         for memory in memories:
@@ -380,27 +1089,153 @@ Now create an introduction:"""
         
         # Build professional intro
         if len(memories) == 1:
-            intro = f"Retrieved 1 memory related to '{query}'."
-        else:
-            type_text = []
-            if memory_types.get('image'):
-                type_text.append(f"{memory_types['image']} image{'s' if memory_types['image'] > 1 else ''}")
-            if memory_types.get('text'):
-                type_text.append(f"{memory_types['text']} text entr{'ies' if memory_types['text'] > 1 else 'y'}")
-            if memory_types.get('voice'):
-                type_text.append(f"{memory_types['voice']} voice recording{'s' if memory_types['voice'] > 1 else ''}")
-            
-            intro = f"Found {len(memories)} relevant memories related to '{query}'"
-            if type_text:
-                intro += f", including {', '.join(type_text)}"
-            intro += "."
+            return f"Retrieved 1 memory related to '{query}'."
+        
+        type_text = []
+        if memory_types.get('image'):
+            type_text.append(f"{memory_types['image']} image{'s' if memory_types['image'] > 1 else ''}")
+        if memory_types.get('text'):
+            type_text.append(f"{memory_types['text']} text entr{'ies' if memory_types['text'] > 1 else 'y'}")
+        if memory_types.get('voice'):
+            type_text.append(f"{memory_types['voice']} voice recording{'s' if memory_types['voice'] > 1 else ''}")
+        
+        intro = f"Found {len(memories)} relevant memories related to '{query}'"
+        if type_text:
+            intro += f", including {', '.join(type_text)}"
+        intro += "."
+        return intro
+
+    def _fallback_search_summary(self, query: str, memories: List[Dict]) -> Dict[str, Any]:
+        """Fallback search summary if Gemini fails"""
+        memory_summaries = [
+            self._memory_summary_entry(memory, self._fallback_summary(memory))
+            for memory in memories
+        ]
         
         return {
-            "summary": intro,
+            "summary": self._fallback_intro(query, memories),
             "memory_summaries": memory_summaries,
             "total_found": len(memories),
             "query": query
         }
 
+class BatchSummaryWorker:
+    """Collects newly created memories and summarizes them via the Gemini batch API
+
+    Enabled with GEMINI_BATCH_MODE=1. Every GEMINI_BATCH_INTERVAL_S seconds the
+    queued memories are submitted as one batch job and the results are handed to
+    the persist callback.
+    """
+
+    def __init__(self, summarizer: GeminiSummarizer):
+        self.summarizer = summarizer
+        self.enabled = os.getenv('GEMINI_BATCH_MODE', '0') == '1'
+        self.interval_s = float(os.getenv('GEMINI_BATCH_INTERVAL_S', '300'))
+        self.max_batch = int(os.getenv('GEMINI_BATCH_MAX_REQUESTS', '1000'))
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task = None
+
+    def enqueue(self, memory: Dict):
+        """Queue a memory for the next batch submission"""
+        if self.enabled:
+            self.queue.put_nowait(memory)
+
+    def start(self, persist):
+        """Start the periodic submit loop; persist is an async (memory_id, summary) callback"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run(persist))
+            print(f"✅ Gemini batch summary worker started (every {self.interval_s:.0f}s)")
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self, persist):
+        while True:
+            await asyncio.sleep(self.interval_s)
+            memories = []
+            while not self.queue.empty() and len(memories) < self.max_batch:
+                memories.append(self.queue.get_nowait())
+            if not memories:
+                continue
+            
+            try:
+                summaries = await self.summarizer.submit_batch(memories)
+                for memory_id, summary in summaries.items():
+                    await persist(memory_id, summary)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Gemini batch summarization failed: {e}")
+
+class SummaryQueueWorker:
+    """Summarizes newly created memories off the request path
+
+    Opt-in (GEMINI_SUMMARY_QUEUE=1): it costs one Gemini call per ingested memory.
+    Ingest endpoints put memories on a bounded asyncio.Queue and return right
+    away; GEMINI_SUMMARY_WORKERS consumer tasks drain it under their own small
+    semaphore, so they never take slots from interactive calls, and hand results
+    to the persist callback (memories.summary, read back by the summarizer).
+    """
+
+    def __init__(self, summarizer: GeminiSummarizer):
+        self.summarizer = summarizer
+        self.enabled = os.getenv('GEMINI_SUMMARY_QUEUE', '0') == '1'
+        self.num_workers = int(os.getenv('GEMINI_SUMMARY_WORKERS', '2'))
+        self._semaphore = asyncio.Semaphore(int(os.getenv('GEMINI_SUMMARY_CONCURRENCY', '2')))
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=int(os.getenv('GEMINI_SUMMARY_QUEUE_SIZE', '1000')))
+        self._tasks: List[asyncio.Task] = []
+        self.dropped = 0
+
+    def enqueue(self, memory: Dict):
+        """Queue a memory for summarization; drops it when the queue is full"""
+        if not self.enabled:
+            return
+        try:
+            self.queue.put_nowait(memory)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            print(f"⚠️ Summary queue full, skipping memory {memory.get('id')}")
+
+    def start(self, persist):
+        """Start the consumer tasks; persist is an async (memory_id, summary) callback"""
+        if self.enabled and not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker(persist)) for _ in range(self.num_workers)]
+            print(f"✅ Summary queue started with {self.num_workers} workers")
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def stats(self) -> Dict:
+        return {"enabled": self.enabled, "workers": len(self._tasks),
+                "queued": self.queue.qsize(), "dropped": self.dropped}
+
+    async def _worker(self, persist):
+        while True:
+            memory = await self.queue.get()
+            try:
+                summary = await self._summarize(memory)
+                if summary:
+                    await persist(memory["id"], summary)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Queued summarization failed for memory {memory.get('id')}: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def _summarize(self, memory: Dict) -> Optional[str]:
+        """Gemini summary to store, None when only the rule-based one applies"""
+        if self.summarizer._is_trivial(memory) or not (self.summarizer.is_initialized or self.summarizer.initialize()):
+            return None
+        prompt = self.summarizer._build_memory_prompt(memory, absolute_date=True)
+        response = await self.summarizer._generate_async(prompt, self._semaphore)
+        return response.text.strip()
+
 # Global instance
 gemini_summarizer = GeminiSummarizer()
+batch_summary_worker = BatchSummaryWorker(gemini_summarizer)
+summary_queue_worker = SummaryQueueWorker(gemini_summarizer)
@@ -1,7 +1,13 @@
 import os
-import requests
+import httpx
+import orjson
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from aiolimiter import AsyncLimiter
+from utils.http import http_client, make_http_client
 
 try:
     from dotenv import load_dotenv
@@ -16,15 +22,34 @@ class GroqClient:
         self.timeout_s = float(os.getenv("GROQ_TIMEOUT_S", "60"))
         self.max_tokens = int(os.getenv("GROQ_MAX_TOKENS", "350"))
         self.temperature = float(os.getenv("GROQ_TEMPERATURE", "0.3"))
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        # Per-call constants, built once: only "messages" varies between requests
+        self._chat_url = f"{self.base_url}/chat/completions"
+        self._base_payload = {"model": self.model, "temperature": self.temperature, "max_tokens": self.max_tokens}
+        # Pooled keep-alive connections (HTTP/2), shared with the Gemini REST calls
+        self.http = http_client
+        self._auth_key = None
+        self._auth_headers = {}
+        # In-flight request cap; tune to the provider's rate limit rather than a thread count
+        self.concurrency = int(os.getenv("GROQ_CONCURRENCY", "16"))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        # Token bucket smoothing bursts to the account's request-per-minute limit
+        self.requests_per_minute = float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+        self._limiter = AsyncLimiter(self.requests_per_minute, 60)
+        self.max_retries = int(os.getenv("GROQ_MAX_RETRIES", "5"))
+        # Upper bound on any wait between attempts, including a server's Retry-After
+        self.max_retry_delay_s = float(os.getenv("GROQ_MAX_RETRY_DELAY_S", "30"))
+        self.metrics = {"success": 0, "rate_limited": 0, "retries": 0, "failed": 0}
+        # Resolved once (env, then backend/.env) and memoized; see invalidate_api_key()
+        self._api_key_lock = threading.Lock()
+        self._api_key = self._resolve_api_key_once()
 
-    def _get_api_key(self) -> str:
+    def _resolve_api_key_once(self):
         api_key = os.getenv("GROQ_API_KEY")
         if api_key:
             return api_key
 
         # Some dev setups (IDE/uvicorn reload) may not inherit newly set shell env vars.
-        # As a fallback, try loading backend/.env at runtime.
+        # As a fallback, try loading backend/.env.
         if load_dotenv is not None:
             try:
                 base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -36,30 +61,74 @@ class GroqClient:
             except Exception:
                 pass
 
-        raise RuntimeError("GROQ_API_KEY is not set")
+        return None
+
+    def _get_api_key(self) -> str:
+        api_key = self._api_key
+        if api_key:
+            return api_key
+
+        with self._api_key_lock:
+            if not self._api_key:
+                self._api_key = self._resolve_api_key_once()
+            if not self._api_key:
+                raise RuntimeError("GROQ_API_KEY is not set")
+            return self._api_key
 
-    def _chat_completions_sync(self, *, system_prompt: str, user_prompt: str) -> str:
+    def invalidate_api_key(self):
+        """Drop the memoized key so the next call re-reads it (key rotation)"""
+        with self._api_key_lock:
+            self._api_key = None
+
+    async def _chat_completions(self, *, system_prompt: str, user_prompt: str,
+                                http: httpx.AsyncClient = None) -> str:
         api_key = self._get_api_key()
-        url = f"{self.base_url}/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
+        http = http or self.http
+        # The client is shared with other providers, so Authorization goes per request;
+        # the header dict is rebuilt only when the key changes
+        if api_key != self._auth_key:
+            self._auth_headers = {"Authorization": f"Bearer {api_key}"}
+            self._auth_key = api_key
         payload = {
-            "model": self.model,
-            "temperature": self.temperature,
-            "max_tokens": self.max_tokens,
+            **self._base_payload,
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
         }
 
-        resp = requests.post(url, headers=headers, json=payload, timeout=self.timeout_s)
+        # Content-Type: application/json is a client default header
+        body = orjson.dumps(payload)
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._limiter:
+                    resp = await http.post(self._chat_url, content=body, headers=self._auth_headers,
+                                           timeout=self.timeout_s)
+            except httpx.TransportError as e:
+                # Timeouts (TimeoutException), resets and refused connections are retried like a 5xx
+                if attempt == self.max_retries:
+                    self.metrics["failed"] += 1
+                    raise
+                resp, reason = None, type(e).__name__
+            else:
+                retryable = resp.status_code == 429 or resp.status_code >= 500
+                if not retryable or attempt == self.max_retries:
+                    break
+                reason = f"HTTP {resp.status_code}"
+
+            delay = min(self.max_retry_delay_s, 2 ** attempt + random.random())
+            if resp is not None and resp.status_code == 429:
+                self.metrics["rate_limited"] += 1
+                delay = self._retry_after(resp.headers.get("Retry-After"), delay)
+            self.metrics["retries"] += 1
+            print(f"⚠️ Groq {reason}, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
         if resp.status_code >= 400:
+            self.metrics["failed"] += 1
             body_preview = resp.text
             try:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 if isinstance(data, dict):
                     err = data.get("error")
                     if isinstance(err, dict) and err.get("message"):
@@ -71,19 +140,48 @@ class GroqClient:
 
             raise RuntimeError(f"Groq HTTP {resp.status_code}: {body_preview}")
 
-        data = resp.json()
+        self.metrics["success"] += 1
+        data = orjson.loads(resp.content)
         choices = data.get("choices") or []
         if not choices:
             return "I don't know."
         message = (choices[0].get("message") or {}).get("content")
         return (message or "I don't know.").strip()
 
+    def _retry_after(self, value, default: float) -> float:
+        """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), clamped"""
+        if not value:
+            return default
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return default
+        return min(max(delay, 0.0), self.max_retry_delay_s)
+
     async def answer(self, *, system_prompt: str, user_prompt: str) -> str:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self.executor,
-            lambda: self._chat_completions_sync(system_prompt=system_prompt, user_prompt=user_prompt),
-        )
+        async with self._semaphore:
+            return await self._chat_completions(system_prompt=system_prompt, user_prompt=user_prompt)
+
+    def answer_sync(self, *, system_prompt: str, user_prompt: str) -> str:
+        """Blocking shim for legacy callers that are not running inside an event loop"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Fresh client: the shared one's connections belong to the app's event loop
+            async def _run():
+                async with make_http_client() as http:
+                    return await self._chat_completions(
+                        system_prompt=system_prompt, user_prompt=user_prompt, http=http
+                    )
+            return asyncio.run(_run())
+        raise RuntimeError("answer_sync() called from a running event loop; await answer() instead")
+
+    def stats(self) -> dict:
+        return {"model": self.model, "concurrency": self.concurrency,
+                "requests_per_minute": self.requests_per_minute, **self.metrics}
 
 
 groq_client = GroqClient()
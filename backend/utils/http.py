@@ -0,0 +1,31 @@
+"""
+Shared async HTTP client for outbound LLM API calls (Groq, Gemini REST)
+
+One pooled HTTP/2 client means both providers reuse keep-alive connections,
+TLS sessions and DNS lookups instead of each holding its own pool.
+"""
+import os
+import httpx
+
+
+def make_http_client() -> httpx.AsyncClient:
+    """Pooled HTTP/2 client; transport retries cover connect errors/resets only, never a sent request"""
+    # With an explicit transport the client ignores its own http2/limits, so the pool is sized here
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(max_connections=128, max_keepalive_connections=64),
+    )
+    return httpx.AsyncClient(
+        timeout=float(os.getenv("HTTP_TIMEOUT_S", "60")),
+        transport=transport,
+        headers={"Content-Type": "application/json"},
+    )
+
+
+# Global instance, bound to the app's event loop on first use
+http_client = make_http_client()
+
+
+async def close_http_client():
+    await http_client.aclose()